@@ -2,23 +2,36 @@ import yaml
 import random
 import numpy as np
 from datetime import datetime
-import psycopg2
 
 class CourseSchedulingProblem:
-    def __init__(self, config_file):
+    def __init__(self, config_file, tables=None):
+        """
+        tables: optional dict of pre-loaded rows ('courses', 'teachers', 'places',
+        'time_slots') in the column order of postgres_code.sql; when given, no
+        database connection is opened (used by benchmark.py)
+        """
         with open(config_file, 'r') as file:
             self.config = yaml.safe_load(file)
         
-        # Connect to PostgreSQL
-        self.conn = psycopg2.connect(
-            dbname="university",
-            user="postgres",
-            password="postgres",
-            host="localhost"
-        )
+        if tables is None:
+            # Connect to PostgreSQL
+            import psycopg2
+            self.conn = psycopg2.connect(
+                dbname="university",
+                user="postgres",
+                password="postgres",
+                host="localhost"
+            )
+            
+            # Load data from database
+            self.load_data()
+        else:
+            self.conn = None
+            self.load_tables(tables)
+        self.build_compatibility()
         
-        # Load data from database
-        self.load_data()
+        # Number of cost function evaluations (for benchmarking)
+        self.evaluations = 0
         
         # BBO options
         self.OPTIONS = {
@@ -56,8 +69,46 @@ class CourseSchedulingProblem:
         
         cur.close()
     
+    def load_tables(self, tables):
+        """Load data from pre-loaded table rows instead of the database"""
+        self.courses = {row[0]: row for row in tables['courses']}
+        self.teachers = {row[0]: row for row in tables['teachers']}
+        self.places = {row[0]: row for row in tables['places']}
+        self.time_slots = {row[0]: row for row in tables['time_slots']}
+    
+    def build_compatibility(self):
+        """Precompute compatible teachers and places of every course once"""
+        self.compatible_teachers = {}
+        self.compatible_places = {}
+        self.gender_places = {}
+        for course_code, course_info in self.courses.items():
+            course_sex = course_info[8]
+            self.compatible_teachers[course_code] = [
+                t[0] for t in self.teachers.values()
+                if course_code in t[8] and (course_sex == 0 or t[7] == course_sex)
+            ]
+            # Gender-only filter used by the repair in feasible_function
+            self.gender_places[course_code] = [
+                p[0] for p in self.places.values()
+                if p[3] == course_sex or p[3] == 0
+            ]
+            self.compatible_places[course_code] = [
+                p[0] for p in self.places.values()
+                if (course_sex == 0 or p[3] == 0 or p[3] == course_sex) and
+                p[4] == 1  # available
+            ]
+        
+        # The courses table has no expected_students column; take it from the
+        # config courses (same default of 30 as the YAML-based schedulers)
+        config_courses = {c['code']: c for c in (self.config.get('courses') or [])}
+        self.expected_students = {
+            course_code: config_courses.get(course_code, {}).get('expected_students', 30)
+            for course_code in self.courses
+        }
+    
     def cost_function(self, population):
         """Calculate cost for each schedule in population"""
+        self.evaluations += len(population)
         for schedule in population:
             cost = 0
             
@@ -158,7 +209,7 @@ class CourseSchedulingProblem:
         
         for course in schedule['courses']:
             place_code = course['place_code']
-            expected_capacity = self.courses[course['course_code']].get('expected_students', 30)
+            expected_capacity = self.expected_students[course['course_code']]
             room_capacity = self.places[place_code][2]
             
             if room_capacity < expected_capacity:
@@ -178,24 +229,18 @@ class CourseSchedulingProblem:
                 # Check teacher-course gender compatibility
                 if course_sex != 0 and teacher_sex != course_sex:
                     # Find a compatible teacher
-                    compatible_teachers = [
-                        t for t in self.teachers.values() 
-                        if t[7] == course_sex and course['course_code'] in t[8]
-                    ]
+                    compatible_teachers = self.compatible_teachers[course['course_code']]
                     
                     if compatible_teachers:
-                        course['teacher_code'] = random.choice(compatible_teachers)[0]
+                        course['teacher_code'] = random.choice(compatible_teachers)
                 
                 # Check place-course gender compatibility
                 if course_sex != 0 and place_sex != 0 and place_sex != course_sex:
                     # Find a compatible place
-                    compatible_places = [
-                        p for p in self.places.values() 
-                        if p[3] == course_sex or p[3] == 0
-                    ]
+                    compatible_places = self.gender_places[course['course_code']]
                     
                     if compatible_places:
-                        course['place_code'] = random.choice(compatible_places)[0]
+                        course['place_code'] = random.choice(compatible_places)
         
         return population
     
@@ -208,23 +253,13 @@ class CourseSchedulingProblem:
             
             # For each course, randomly assign teacher, place and time slot
             for course_code, course_info in self.courses.items():
-                # Find compatible teachers
-                compatible_teachers = [
-                    t[0] for t in self.teachers.values() 
-                    if course_code in t[8] and (
-                        course_info[8] == 0 or t[7] == course_info[8]
-                    )
-                ]
+                # Compatible teachers and places (precomputed in build_compatibility)
+                compatible_teachers = self.compatible_teachers[course_code]
                 
                 if not compatible_teachers:
                     continue
                 
-                # Find compatible places
-                compatible_places = [
-                    p[0] for p in self.places.values() 
-                    if (course_info[8] == 0 or p[3] == 0 or p[3] == course_info[8]) and
-                    p[4] == 1  # available
-                ]
+                compatible_places = self.compatible_places[course_code]
                 
                 if not compatible_places:
                     continue
@@ -305,24 +340,12 @@ class CourseSchedulingProblem:
                         course = population[i]['courses'][j]
                         
                         # Mutate teacher
-                        compatible_teachers = [
-                            t[0] for t in self.teachers.values() 
-                            if course['course_code'] in t[8] and (
-                                self.courses[course['course_code']][8] == 0 or 
-                                t[7] == self.courses[course['course_code']][8]
-                            )
-                        ]
+                        compatible_teachers = self.compatible_teachers[course['course_code']]
                         if compatible_teachers:
                             course['teacher_code'] = random.choice(compatible_teachers)
                         
                         # Mutate place
-                        compatible_places = [
-                            p[0] for p in self.places.values() 
-                            if (self.courses[course['course_code']][8] == 0 or 
-                                p[3] == 0 or 
-                                p[3] == self.courses[course['course_code']][8]) and
-                            p[4] == 1
-                        ]
+                        compatible_places = self.compatible_places[course['course_code']]
                         if compatible_places:
                             course['place_code'] = random.choice(compatible_places)
                         
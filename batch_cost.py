@@ -0,0 +1,256 @@
+import numpy as np
+
+from encoding import TEACHER, PLACE, SLOT, DAY
+from constraints import BatchView, compile_constraint_kernels
+from profiling import term_phase
+
+
+class BatchCostEvaluator:
+    """
+    ارزیابی برداری هزینه کل جمعیت با NumPy
+
+    همه جداول ایستا (ماتریس ظرفیت درس×مکان، عدم تطابق جنسیت، کرنل‌های محدودیت،
+    یال‌های پیش‌نیاز و ...) یک بار ساخته می‌شوند و هر فراخوانی evaluate کل جمعیت
+    فشرده را بدون حلقه پایتونی روی افراد و دروس امتیازدهی می‌کند. نتیجه با
+    مجموع جملات cost_function زمان‌بند برابر است.
+    """
+
+    # نام جملات هزینه به همان ترتیب cost_function (کرنل‌های محدودیت بین این دو گروه قرار می‌گیرند)
+    TERMS_BEFORE = (
+        'teacher_conflicts', 'place_conflicts', 'workload', 'capacity',
+        'prerequisite', 'corequisite'
+    )
+    TERMS_AFTER = ('place_usage', 'gender_mismatch', 'place_overuse')
+    # جمله هزینه -> کلید ضریب آن در OPTIONS (ضریب کرنل‌ها در cost_option خودشان است)
+    TERM_OPTIONS = {
+        'teacher_conflicts': 'teacher_conflict_cost',
+        'place_conflicts': 'place_conflict_cost',
+        'workload': 'workload_cost',
+        'capacity': 'capacity_cost',
+        'prerequisite': 'prereq_cost',
+        'corequisite': 'coreq_cost',
+        'place_usage': 'place_usage_cost',
+        'gender_mismatch': 'gender_mismatch_cost',
+        'place_overuse': 'place_overuse_cost'
+    }
+
+    def __init__(self, index, courses, teachers, places, time_slots, constraints,
+                 prerequisites, corequisites, options, max_place_usage):
+        self.index = index
+        self.options = options
+        self.max_place_usage = max_place_usage
+        self.prerequisites = prerequisites
+        self.corequisites = corequisites
+        self.num_teachers = len(index.teacher_codes)
+        self.num_places = len(index.place_codes)
+        self.num_slots = len(index.slot_ids)
+        self.num_days = index.num_days
+
+        # مقدار شناسه اسلات‌ها (مقایسه پیش‌نیاز/هم‌نیاز روی شناسه انجام می‌شود)
+        self.slot_values = np.array(index.slot_ids, dtype=np.int64)
+
+        # اطلاعات دروس بر حسب اندیس
+        course_list = [courses[code] for code in index.course_codes]
+        self.course_units = np.array([c.get('units', 0) for c in course_list], dtype=np.int64)
+        self.course_gender = np.array([c.get('gender', 0) for c in course_list], dtype=np.int64)
+        expected = np.array([c.get('expected_students', 30) for c in course_list])
+
+        teacher_list = [teachers[code] for code in index.teacher_codes]
+        self.min_units = np.array([t['min_units'] for t in teacher_list])
+        self.max_units = np.array([t['max_units'] for t in teacher_list])
+        teacher_gender = np.array([t.get('gender', 0) for t in teacher_list])
+
+        place_list = [places[code] for code in index.place_codes]
+        capacity = np.array([p['capacity'] for p in place_list])
+        place_gender = np.array([p.get('gender', 0) for p in place_list])
+
+        # ماتریس‌های ایستا درس×مکان و درس×استاد
+        gendered = self.course_gender[:, None] != 0
+        self.capacity_bad = (capacity[None, :] < expected[:, None]).astype(np.int64)
+        self.place_gender_bad = (
+            gendered & (place_gender[None, :] != 0) &
+            (place_gender[None, :] != self.course_gender[:, None])
+        ).astype(np.int64)
+        self.teacher_gender_bad = (
+            gendered & (teacher_gender[None, :] != self.course_gender[:, None])
+        ).astype(np.int64)
+        self.genders = sorted(set(self.course_gender.tolist()) - {0})
+
+        self.compile_constraints(constraints, teachers, time_slots)
+        self._layouts = {}
+        # PhaseProfiler اختیاری برای زمان‌سنجی هر جمله (OPTIONS['profile'] زمان‌بند)
+        self.profiler = None
+
+    @classmethod
+    def from_scheduler(cls, scheduler):
+        """ساخت ارزیاب از داده‌های یک زمان‌بند GWO یا BBO"""
+        evaluator = cls(
+            scheduler.index, scheduler.courses, scheduler.teachers, scheduler.places,
+            scheduler.time_slots, scheduler.constraints, scheduler.prerequisites,
+            scheduler.corequisites, scheduler.OPTIONS, scheduler.max_place_usage
+        )
+        evaluator.profiler = getattr(scheduler, 'profiler', None)
+        return evaluator
+
+    def compile_constraints(self, constraints, teachers, time_slots):
+        """کامپایل یک‌باره بخش constraints به کرنل‌های محدودیت (فرم دسته‌ای آن‌ها استفاده می‌شود)"""
+        self.kernels = compile_constraint_kernels(constraints, self.index, teachers, time_slots)
+        self.terms = self.TERMS_BEFORE + tuple(k.type_name for k in self.kernels) + self.TERMS_AFTER
+
+    def layout(self, course_order):
+        """جداول وابسته به ترتیب دروس (یال‌های پیش‌نیاز، اعضای محدودیت‌ها) با کش"""
+        key = course_order.tobytes()
+        cached = self._layouts.get(key)
+        if cached is not None:
+            return cached
+
+        codes = [self.index.course_codes[i] for i in course_order.tolist()]
+        position = {}
+        for j, code in enumerate(codes):
+            position.setdefault(code, j)
+
+        def edges(requisites):
+            present, missing = [], 0
+            for j, code in enumerate(codes):
+                for req in requisites.get(code, []):
+                    if req in position:
+                        present.append((j, position[req]))
+                    else:
+                        missing += 1
+            return np.array(present, dtype=np.int64).reshape(-1, 2), missing
+
+        layout = {
+            'units': self.course_units[course_order],
+            'gender': self.course_gender[course_order],
+            'prereq': edges(self.prerequisites),
+            'coreq': edges(self.corequisites)
+        }
+        self._layouts[key] = layout
+        return layout
+
+    def evaluate(self, encoded):
+        """هزینه کل هر فرد جمعیت فشرده (آرایه float64)"""
+        return self.evaluate_genes(encoded.genes, encoded.course_order)
+
+    def evaluate_genes(self, genes, course_order):
+        """هزینه کل برای آرایه خام ژن‌ها (جمعیت × دروس × 4)"""
+        terms = self.term_costs(genes, course_order)
+        return np.sum([terms[name] for name in self.terms], axis=0).astype(np.float64)
+
+    def term_costs(self, genes, course_order):
+        """هزینه هر جمله به تفکیک برای همه افراد"""
+        opts = self.options
+        pop, n = genes.shape[0], genes.shape[1]
+        layout = self.layout(np.asarray(course_order))
+        course_order = np.asarray(course_order)
+
+        teacher = genes[:, :, TEACHER].astype(np.int64)
+        place = genes[:, :, PLACE].astype(np.int64)
+        slot = genes[:, :, SLOT].astype(np.int64)
+        day = genes[:, :, DAY].astype(np.int64)
+        day_slot = day * self.num_slots + slot
+        num_day_slots = self.num_days * self.num_slots
+        offsets = np.arange(pop, dtype=np.int64)[:, None]
+
+        profiler = self.profiler
+        terms = {}
+
+        # تداخل استاد و مکان: تعداد تکرار کلیدهای (استاد/مکان، روز، اسلات)
+        with term_phase(profiler, 'teacher_conflicts'):
+            terms['teacher_conflicts'] = self._duplicates(teacher * num_day_slots + day_slot) * opts['teacher_conflict_cost']
+        with term_phase(profiler, 'place_conflicts'):
+            terms['place_conflicts'] = self._duplicates(place * num_day_slots + day_slot) * opts['place_conflict_cost']
+
+        # بار کاری: مجموع واحدها و تعداد کلاس‌های هر استاد
+        with term_phase(profiler, 'workload'):
+            flat_teacher = (offsets * self.num_teachers + teacher).ravel()
+            size = pop * self.num_teachers
+            units = np.bincount(flat_teacher, weights=np.broadcast_to(layout['units'], (pop, n)).ravel(), minlength=size)
+            units = units.reshape(pop, self.num_teachers)
+            counts = np.bincount(flat_teacher, minlength=size).reshape(pop, self.num_teachers)
+            bad = (counts > 0) & ((units < self.min_units) | (units > self.max_units))
+            terms['workload'] = bad.sum(axis=1) * opts['workload_cost']
+
+        # ظرفیت از ماتریس ایستای درس×مکان
+        rows = course_order[None, :]
+        with term_phase(profiler, 'capacity'):
+            terms['capacity'] = self.capacity_bad[rows, place].sum(axis=1) * opts['capacity_cost']
+
+        # پیش‌نیازها و هم‌نیازها روی یال‌های صحیح
+        slot_value = self.slot_values[slot]
+        with term_phase(profiler, 'prerequisite'):
+            (pairs, missing) = layout['prereq']
+            violations = np.full(pop, missing, dtype=np.int64)
+            if len(pairs):
+                c, p = pairs[:, 0], pairs[:, 1]
+                ok = (day[:, p] < day[:, c]) | ((day[:, p] == day[:, c]) & (slot_value[:, p] < slot_value[:, c]))
+                violations += (~ok).sum(axis=1)
+            terms['prerequisite'] = violations * opts['prereq_cost']
+
+        with term_phase(profiler, 'corequisite'):
+            (pairs, missing) = layout['coreq']
+            violations = np.full(pop, missing, dtype=np.int64)
+            if len(pairs):
+                c, p = pairs[:, 0], pairs[:, 1]
+                ok = (day[:, p] == day[:, c]) & (np.abs(slot_value[:, p] - slot_value[:, c]) <= 1)
+                violations += (~ok).sum(axis=1)
+            terms['corequisite'] = violations * opts['coreq_cost']
+
+        # محدودیت‌های بخش constraints: فرم دسته‌ای هر کرنل ثبت‌شده
+        view = BatchView(teacher, place, slot, day, course_order, self.num_slots)
+        for kernel in self.kernels:
+            with term_phase(profiler, kernel.type_name):
+                terms[kernel.type_name] = kernel.batch(view) * opts[kernel.cost_option]
+
+        # توزیع و استفاده بیش از حد مکان‌ها
+        with term_phase(profiler, 'place_usage'):
+            flat_place = (offsets * self.num_places + place).ravel()
+            usage = np.bincount(flat_place, minlength=pop * self.num_places).reshape(pop, self.num_places)
+            used = usage > 0
+            num_used = used.sum(axis=1)
+            max_usage = np.where(used, usage, 0).max(axis=1, initial=0)
+            min_usage = np.where(used, usage, np.iinfo(np.int64).max).min(axis=1, initial=np.iinfo(np.int64).max)
+            min_usage = np.where(num_used > 0, min_usage, 0)
+            terms['place_usage'] = (max_usage - min_usage) * opts['place_usage_cost']
+
+            avg_usage = np.where(num_used > 0, n / np.maximum(num_used, 1), 0.0)[:, None]
+            over = used & ((usage > avg_usage * 1.5) | (usage > self.max_place_usage))
+            terms['place_overuse'] = (np.where(over, usage - avg_usage, 0.0).sum(axis=1)) * opts['place_overuse_cost']
+
+        # عدم تطابق جنسیت از ماتریس‌های ایستا و تداخل جنسیتی: (روز، اسلات، مکان) با بیش از یک جنسیت
+        with term_phase(profiler, 'gender_mismatch'):
+            gender_static = (self.place_gender_bad[rows, place] + self.teacher_gender_bad[rows, teacher]).sum(axis=1)
+            slot_place = day_slot * self.num_places + place
+            num_keys = num_day_slots * self.num_places
+            present = np.zeros((pop, num_keys), dtype=np.int64)
+            for gender in self.genders:
+                mask = np.broadcast_to(layout['gender'] == gender, (pop, n)).ravel()
+                keys = (offsets * num_keys + slot_place).ravel()[mask]
+                present += np.bincount(keys, minlength=pop * num_keys).reshape(pop, num_keys) > 0
+            gender_clash = (present > 1).sum(axis=1)
+            terms['gender_mismatch'] = (gender_static + gender_clash) * opts['gender_mismatch_cost']
+
+        return terms
+
+    def violation_counts(self, genes, course_order):
+        """تعداد نقض هر جمله (هزینه جمله تقسیم بر ضریب آن) برای همه افراد"""
+        # این ارزیابی گزارشی است و در پروفایل جملات هزینه شمرده نمی‌شود
+        profiler, self.profiler = self.profiler, None
+        try:
+            terms = self.term_costs(genes, course_order)
+        finally:
+            self.profiler = profiler
+        weights = dict(self.TERM_OPTIONS, **{kernel.type_name: kernel.cost_option for kernel in self.kernels})
+        counts = {}
+        for name in self.terms:
+            weight = self.options[weights[name]]
+            counts[name] = terms[name] / weight if weight else np.zeros(len(genes))
+        return counts
+
+    @staticmethod
+    def _duplicates(keys):
+        """تعداد تکرارهای اضافی هر کلید در هر سطر"""
+        if keys.shape[1] < 2:
+            return np.zeros(keys.shape[0], dtype=np.int64)
+        ordered = np.sort(keys, axis=1)
+        return (ordered[:, 1:] == ordered[:, :-1]).sum(axis=1)
@@ -0,0 +1,186 @@
+import csv
+import time
+import statistics
+import multiprocessing as mp
+
+from gwo_pro import GWOScheduler
+from bbo_new import BBOScheduler
+from seeding import spawn_seeds
+
+# موتورهای قابل اجرا در آزمایش دسته‌ای: نام -> کلاس زمان‌بند
+ENGINES = {
+    'gwo': GWOScheduler,
+    'bbo': BBOScheduler
+}
+
+# OPTIONS مشترک همه اجراها: بدون خروجی کنسول
+QUIET_OPTIONS = {'verbose': 0, 'telemetry': 'null'}
+
+# زمان‌بندهای ساخته‌شده در هر پردازه کارگر: نام موتور -> (زمان‌بند، OPTIONS اولیه)
+_schedulers = {}
+_worker_config = {}
+
+
+def _init_worker(config_file, options):
+    """بارگذاری یک‌باره تنظیمات در هر پردازه (زمان‌بندها در اولین اجرا ساخته می‌شوند)"""
+    _schedulers.clear()
+    _worker_config['config_file'] = config_file
+    _worker_config['options'] = options
+
+
+def _scheduler_for(engine, seed):
+    """زمان‌بند موتور در این پردازه؛ مسئله فقط یک بار بارگذاری و آماده می‌شود"""
+    if engine not in _schedulers:
+        # گزینه‌های موتور پیش از ساخت اعمال می‌شوند تا جداول وابسته به آن‌ها
+        # (مانند مکان‌های مناسب با capacity_aware_places) درست ساخته شوند
+        options = dict(QUIET_OPTIONS, **_worker_config['options'].get(engine, {}))
+        scheduler = ENGINES[engine](_worker_config['config_file'], options)
+        if 'workers' in scheduler.OPTIONS:
+            scheduler.OPTIONS['workers'] = 0  # هر اجرا خود در یک پردازه کارگر است
+        _schedulers[engine] = (scheduler, dict(scheduler.OPTIONS))
+    scheduler, base_options = _schedulers[engine]
+    # بازنشانی وضعیت اجرای قبلی تا نتیجه فقط به بذر وابسته باشد
+    scheduler.OPTIONS.clear()
+    scheduler.OPTIONS.update(base_options)
+    scheduler.place_usage.clear()
+    scheduler.evaluations = 0
+    scheduler.reseed(seed)
+    return scheduler
+
+
+def _run_one(task):
+    """یک اجرای بذردار از یک موتور و اندازه‌گیری هزینه، زمان و زمان رسیدن به هدف"""
+    engine, run, seed, target_cost = task
+    scheduler = _scheduler_for(engine, seed)
+
+    start = time.perf_counter()
+    hit = {}
+
+    def on_iteration(iteration, best):
+        if target_cost is not None and not hit and best['cost'] <= target_cost:
+            hit['time'] = time.perf_counter() - start
+            hit['evaluations'] = scheduler.evaluations
+            hit['iteration'] = iteration
+
+    best = scheduler.run_algorithm(callback=on_iteration)
+    return {
+        'engine': engine,
+        'run': run,
+        'best_cost': best['cost'],
+        'wall_time': time.perf_counter() - start,
+        'evaluations': scheduler.evaluations,
+        'stop_reason': scheduler.stop_reason,
+        'time_to_target': hit.get('time'),
+        'evaluations_to_target': hit.get('evaluations'),
+        'iterations_to_target': hit.get('iteration')
+    }
+
+
+def run_batch(config_file, engines=('gwo', 'bbo'), runs=10, iterations=None, seed=0,
+              workers=None, target_cost=None, options=None):
+    """
+    اجرای چند اجرای بذردار از هر موتور به صورت هم‌زمان روی یک استخر پردازه
+
+    پارامترها:
+        config_file (str): مسیر فایل پیکربندی YAML
+        engines (tuple): نام موتورها از ENGINES
+        runs (int): تعداد اجرای هر موتور (اجرای k با جریان تصادفی فرزند k از seed)
+        iterations (int): تعداد تکرار/نسل همه موتورها (None = پیش‌فرض هر موتور)
+        seed (int): بذر پایه
+        workers (int): تعداد پردازه‌ها (None = تعداد هسته‌ها، 0 یا 1 = سریال)
+        target_cost (float): هزینه هدف برای اندازه‌گیری زمان رسیدن به هدف
+        options (dict): تغییرات OPTIONS هر موتور: نام موتور -> دیکشنری
+
+    خروجی:
+        فهرست نتایج هر اجرا (مرتب بر اساس موتور و شماره اجرا)
+    """
+    options = {engine: dict((options or {}).get(engine, {})) for engine in engines}
+    if iterations is not None:
+        for engine in engines:
+            options[engine].setdefault(ENGINES[engine].ITERATIONS_OPTION, iterations)
+    seeds = spawn_seeds(seed, runs)
+    tasks = [(engine, k, seeds[k], target_cost) for engine in engines for k in range(runs)]
+
+    workers = mp.cpu_count() if workers is None else workers
+    if workers <= 1:
+        _init_worker(config_file, options)
+        results = [_run_one(task) for task in tasks]
+    else:
+        with mp.Pool(min(workers, len(tasks)), initializer=_init_worker,
+                     initargs=(config_file, options)) as pool:
+            results = pool.map(_run_one, tasks, chunksize=1)
+
+    return sorted(results, key=lambda r: (r['engine'], r['run']))
+
+
+def summarize(results):
+    """جدول خلاصه هر موتور: بهترین/میانگین/انحراف معیار هزینه، زمان، ارزیابی‌ها و رسیدن به هدف"""
+    table = []
+    for engine in dict.fromkeys(r['engine'] for r in results):
+        rows = [r for r in results if r['engine'] == engine]
+        costs = [r['best_cost'] for r in rows]
+        hits = [r for r in rows if r['time_to_target'] is not None]
+        table.append({
+            'engine': engine,
+            'runs': len(rows),
+            'best_cost': min(costs),
+            'mean_cost': statistics.mean(costs),
+            'std_cost': statistics.stdev(costs) if len(costs) > 1 else 0.0,
+            'worst_cost': max(costs),
+            'mean_time': statistics.mean(r['wall_time'] for r in rows),
+            'mean_evaluations': statistics.mean(r['evaluations'] for r in rows),
+            'target_hits': len(hits),
+            'mean_time_to_target': statistics.mean(r['time_to_target'] for r in hits) if hits else None,
+            'mean_evaluations_to_target': (
+                statistics.mean(r['evaluations_to_target'] for r in hits) if hits else None
+            )
+        })
+    return table
+
+
+def print_summary(table):
+    """چاپ جدول خلاصه در کنسول"""
+    print(f"{'موتور':<8}{'اجرا':>6}{'بهترین':>10}{'میانگین':>12}{'انحراف':>10}{'بدترین':>10}"
+          f"{'زمان (s)':>10}{'ارزیابی':>10}{'رسیدن به هدف':>14}")
+    print("-" * 90)
+    for row in table:
+        print(f"{row['engine']:<8}{row['runs']:>6}{row['best_cost']:>10.1f}{row['mean_cost']:>12.2f}"
+              f"{row['std_cost']:>10.2f}{row['worst_cost']:>10.1f}{row['mean_time']:>10.2f}"
+              f"{row['mean_evaluations']:>10.0f}{row['target_hits']:>8}/{row['runs']}")
+
+
+def write_csv(rows, path):
+    """ذخیره نتایج اجراها یا جدول خلاصه به صورت CSV"""
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def plot_results(results, path):
+    """ذخیره نمودار هزینه هر اجرا برای هر موتور در فایل تصویری (بدون نمایشگر)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    for engine in dict.fromkeys(r['engine'] for r in results):
+        costs = [r['best_cost'] for r in results if r['engine'] == engine]
+        ax.plot(costs, label=engine.upper(), marker='o')
+    ax.set_title("مقایسه هزینه در اجراهای مستقل")
+    ax.set_xlabel("شماره اجرا")
+    ax.set_ylabel("Cost")
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+if __name__ == "__main__":
+    print("شروع اجرای دسته‌ای موتورهای زمان‌بندی...")
+    results = run_batch("config.yaml", runs=10)
+    print_summary(summarize(results))
+    write_csv(results, "batch_results.csv")
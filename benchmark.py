@@ -0,0 +1,292 @@
+import io
+import os
+import csv
+import time
+import random
+import contextlib
+import tracemalloc
+
+import yaml
+import numpy as np
+
+from gwo_pro import GWOScheduler
+from bbo_new import BBOScheduler
+from Code_python import CourseSchedulingProblem
+from batch_runner import QUIET_OPTIONS
+
+# اندازه‌های پیش‌فرض نمونه‌های مصنوعی (از یک دانشکده تا کل دانشگاه)
+DEFAULT_SIZES = [
+    {'num_courses': 40, 'num_teachers': 10, 'num_places': 12},
+    {'num_courses': 150, 'num_teachers': 40, 'num_places': 30},
+    {'num_courses': 500, 'num_teachers': 120, 'num_places': 80},
+]
+
+PLACE_TYPES = ['کلاس تئوری', 'سالن ورزشی', 'آزمایشگاه']
+PLACE_TYPE_WEIGHTS = [0.6, 0.3, 0.1]
+
+
+def generate_instance(num_courses, num_teachers, num_places, num_days=5, num_slots=5,
+                      constraint_density=0.1, seed=0):
+    """
+    ساخت یک نمونه مصنوعی با قالب config.yaml
+
+    پارامترها:
+        num_courses (int): تعداد دروس
+        num_teachers (int): تعداد اساتید
+        num_places (int): تعداد مکان‌ها
+        num_days (int): تعداد روزهای هفته
+        num_slots (int): تعداد اسلات‌های زمانی هر روز
+        constraint_density (float): نسبت محدودیت‌ها و پیش‌نیازها به اندازه مسئله
+        seed (int): بذر تصادفی (نمونه‌ها با بذر یکسان یکسان‌اند)
+    """
+    rng = random.Random(seed)
+
+    settings = {
+        'university_name': 'دانشگاه مصنوعی',
+        'semester': 'محک',
+        'days_of_week': [f"روز {d + 1}" for d in range(num_days)],
+        'time_slots': [
+            {'id': k + 1, 'start': f"{8 + 2 * k:02d}:00", 'end': f"{9 + 2 * k:02d}:30"}
+            for k in range(num_slots)
+        ],
+        'max_units_per_student': 20,
+        'max_classes_per_day': 3
+    }
+
+    # از هر نوع مکان حداقل یک مکان عمومی در دسترس وجود دارد
+    places = []
+    for j in range(num_places):
+        place_type = PLACE_TYPES[j] if j < len(PLACE_TYPES) else rng.choices(PLACE_TYPES, PLACE_TYPE_WEIGHTS)[0]
+        public = j < len(PLACE_TYPES)
+        places.append({
+            'code': f"P{j + 1}",
+            'name': f"مکان {j + 1}",
+            'capacity': rng.choice([20, 25, 30, 40, 50]),
+            'type': place_type,
+            'gender': 0 if public or rng.random() < 0.8 else rng.choice([1, 2]),
+            'facilities': [],
+            'available': public or rng.random() < 0.95
+        })
+
+    teachers = []
+    for k in range(num_teachers):
+        min_units = rng.randint(4, 8)
+        teachers.append({
+            'code': f"T{k + 1:03d}",
+            'full_name': f"استاد {k + 1}",
+            'gender': 1 + k % 2,
+            'degree': rng.randint(1, 3),
+            'employment_type': rng.randint(1, 3),
+            'position': rng.randint(1, 4),
+            'max_units': min_units + rng.randint(4, 8),
+            'min_units': min_units,
+            'unavailable_times': [],
+            'courses': []
+        })
+
+    courses = []
+    for i in range(num_courses):
+        code = f"C{i + 1:03d}"
+        gender = 0 if rng.random() < 0.9 else rng.choice([1, 2])
+        # اساتید درس (برای درس تک‌جنسیتی حداقل یک استاد هم‌جنس)
+        candidates = [t for t in teachers if gender == 0 or t['gender'] == gender]
+        course_teachers = rng.sample(candidates, min(len(candidates), rng.randint(1, 3)))
+        for teacher in course_teachers:
+            teacher['courses'].append(code)
+        earlier = [c['code'] for c in courses]
+        courses.append({
+            'code': code,
+            'name': f"درس {i + 1}",
+            'type': 'تئوری',
+            'unit_type': 'اصلی',
+            'units': rng.choice([2, 2, 3]),
+            'priority': rng.randint(1, 3),
+            'gender': gender,
+            'required_place_type': rng.choices(PLACE_TYPES, PLACE_TYPE_WEIGHTS)[0],
+            'prerequisites': [rng.choice(earlier)] if earlier and rng.random() < constraint_density else [],
+            'corequisites': [rng.choice(earlier)] if earlier and rng.random() < constraint_density / 2 else [],
+            'expected_students': rng.choice([15, 20, 25, 30, 35]),
+            'teachers': [t['code'] for t in course_teachers]
+        })
+
+    constraints = []
+    num_constraints = max(1, int(round(constraint_density * (num_teachers + num_places))))
+    for n in range(num_constraints):
+        kind = n % 4
+        if kind == 0:
+            constraints.append({
+                'type': 'teacher_unavailable',
+                'teacher_code': rng.choice(teachers)['code'],
+                'day': rng.randint(1, num_days),
+                'time_slots': sorted(rng.sample(range(1, num_slots + 1), min(2, num_slots)))
+            })
+        elif kind == 1:
+            start = rng.randint(1, num_days)
+            constraints.append({
+                'type': 'place_maintenance',
+                'place_code': rng.choice(places)['code'],
+                'start_date': f"2024-04-{start:02d}",
+                'end_date': f"2024-04-{rng.randint(start, num_days):02d}"
+            })
+        elif kind == 2 and num_courses >= 2:
+            constraints.append({
+                'type': 'concurrent_courses',
+                'course_codes': [c['code'] for c in rng.sample(courses, 2)],
+                'max_concurrent': 1
+            })
+        else:
+            constraints.append({
+                'type': 'same_teacher_courses',
+                'teacher_code': rng.choice(teachers)['code'],
+                'min_hours_between': 2
+            })
+
+    return {
+        'settings': settings,
+        'places': places,
+        'teachers': teachers,
+        'courses': courses,
+        'student_groups': [],
+        'constraints': constraints
+    }
+
+
+def write_instance(config, path):
+    """ذخیره نمونه مصنوعی به صورت فایل YAML"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        yaml.safe_dump(config, file, allow_unicode=True, sort_keys=False)
+    return path
+
+
+def database_tables(config):
+    """ردیف‌های جداول postgres_code.sql برای CourseSchedulingProblem بدون پایگاه داده"""
+    slots = config['settings']['time_slots']
+    return {
+        'courses': [
+            (c['code'], c['name'], c['units'], 1, 1, c.get('prerequisites', []),
+             c.get('corequisites', []), c.get('required_place_type'), c.get('gender', 0))
+            for c in config['courses']
+        ],
+        'teachers': [
+            (t['code'], t['full_name'], t['position'], t['employment_type'], t['max_units'],
+             t['min_units'], t['degree'], t['gender'], t['courses'])
+            for t in config['teachers']
+        ],
+        'places': [
+            (p['code'], p['name'], p['capacity'], p['gender'], 1 if p['available'] else 0)
+            for p in config['places']
+        ],
+        # در این جدول هر ردیف یک (روز، اسلات) است
+        'time_slots': [
+            (d * len(slots) + k + 1, d + 1, s['start'], s['end'])
+            for d in range(len(config['settings']['days_of_week']))
+            for k, s in enumerate(slots)
+        ]
+    }
+
+
+# موتورهای جدید بی‌صدا ساخته می‌شوند تا قالب‌بندی رکوردهای پیشرفت در زمان اندازه‌گیری‌شده نباشد
+def _run_gwo(config_file, config, iterations, seed):
+    scheduler = GWOScheduler(config_file, dict(QUIET_OPTIONS, max_iterations=iterations), seed=seed)
+    return scheduler, scheduler.run_algorithm()
+
+
+def _run_bbo(config_file, config, iterations, seed):
+    scheduler = BBOScheduler(config_file, dict(QUIET_OPTIONS, maxgen=iterations), seed=seed)
+    return scheduler, scheduler.run_algorithm()
+
+
+def _run_basic_bbo(config_file, config, iterations, seed):
+    # نسخه پایه فقط از مولدهای سراسری استفاده می‌کند و گزینه بی‌صدا ندارد
+    random.seed(seed)
+    np.random.seed(seed)
+    problem = CourseSchedulingProblem(config_file, tables=database_tables(config))
+    problem.OPTIONS['maxgen'] = iterations
+    with contextlib.redirect_stdout(io.StringIO()):
+        return problem, problem.run_bbo()
+
+
+# موتورهای قابل محک‌زنی: نام -> تابع اجرا
+ENGINES = {
+    'gwo': _run_gwo,
+    'bbo': _run_bbo,
+    'bbo_basic': _run_basic_bbo
+}
+
+
+def run_engine(engine, config_file, config, iterations, seed=0, trace_memory=True):
+    """
+    اجرای بی‌صدای یک موتور روی یک نمونه و اندازه‌گیری زمان، حافظه و هزینه
+
+    خروجی:
+        دیکشنری شامل زمان اجرا، تعداد ارزیابی‌ها، ارزیابی در ثانیه،
+        اوج حافظه (مگابایت)، بهترین هزینه و دلیل توقف
+    """
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        scheduler, best = ENGINES[engine](config_file, config, iterations, seed)
+        wall_time = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    return {
+        'engine': engine,
+        'wall_time': wall_time,
+        'evaluations': scheduler.evaluations,
+        'evals_per_sec': scheduler.evaluations / wall_time if wall_time > 0 else 0.0,
+        'peak_memory_mb': peak / (1024 * 1024),
+        'best_cost': best['cost'],
+        'stop_reason': getattr(scheduler, 'stop_reason', None)
+    }
+
+
+def run_benchmark(sizes=None, engines=None, iterations=20, out_dir='benchmark_instances',
+                  seed=0, csv_file=None, trace_memory=True):
+    """
+    ساخت نمونه‌های مصنوعی و اجرای همه موتورها روی هر اندازه
+
+    پارامترها:
+        sizes (list): پارامترهای generate_instance برای هر اندازه
+        engines (list): نام موتورها از ENGINES
+        iterations (int): تعداد تکرار/نسل هر موتور
+        out_dir (str): پوشه ذخیره فایل‌های YAML نمونه‌ها
+        seed (int): بذر تصادفی نمونه‌ها و اجراها
+        csv_file (str): مسیر اختیاری ذخیره نتایج به صورت CSV
+        trace_memory (bool): اندازه‌گیری اوج حافظه با tracemalloc (اجرا را کندتر می‌کند)
+    """
+    sizes = sizes or DEFAULT_SIZES
+    engines = engines or list(ENGINES)
+    results = []
+
+    for size in sizes:
+        config = generate_instance(seed=seed, **size)
+        name = '_'.join(f"{size[k]}" for k in ('num_courses', 'num_teachers', 'num_places'))
+        config_file = write_instance(config, os.path.join(out_dir, f"instance_{name}.yaml"))
+
+        for engine in engines:
+            row = dict(size)
+            row.update(run_engine(engine, config_file, config, iterations, seed, trace_memory))
+            results.append(row)
+            print(
+                f"{engine:<10} دروس={size['num_courses']:<5} زمان={row['wall_time']:.2f}s "
+                f"ارزیابی/ثانیه={row['evals_per_sec']:.0f} حافظه={row['peak_memory_mb']:.1f}MB "
+                f"هزینه={row['best_cost']}"
+            )
+
+    if csv_file and results:
+        with open(csv_file, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+
+    return results
+
+
+if __name__ == "__main__":
+    print("شروع محک‌زنی موتورهای زمان‌بندی روی نمونه‌های مصنوعی...")
+    run_benchmark(csv_file="benchmark_results.csv")
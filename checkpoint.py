@@ -0,0 +1,55 @@
+import os
+import pickle
+import tempfile
+
+from encoding import EncodedPopulation
+from cow import CowList
+
+# با هر تغییر در ساختار فایل نقطه بازیابی این عدد افزایش می‌یابد
+CHECKPOINT_VERSION = 3
+
+
+def encode_solutions(index, solutions, key):
+    """تبدیل فهرست راه‌حل‌ها به آرایه‌های فشرده قابل ذخیره (بدون شمارنده‌های اشغال)"""
+    encoded = EncodedPopulation.from_schedules(index, solutions, key)
+    return {'course_order': encoded.course_order, 'genes': encoded.genes, 'costs': encoded.costs}
+
+
+def decode_solutions(index, data, key):
+    """بازسازی فهرست راه‌حل‌ها از آرایه‌های ذخیره‌شده با encode_solutions"""
+    encoded = EncodedPopulation(index, data['course_order'], data['genes'], data['costs'])
+    solutions = encoded.to_schedules(key)
+    for solution in solutions:
+        solution[key] = CowList(solution[key])
+    return solutions
+
+
+def save_checkpoint(path, payload):
+    """
+    نوشتن اتمیک نقطه بازیابی (فایل موقت در همان پوشه و سپس os.replace)
+
+    اگر اجرا هنگام نوشتن متوقف شود، نقطه بازیابی قبلی سالم باقی می‌ماند.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            pickle.dump(dict(payload, version=CHECKPOINT_VERSION), file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def load_checkpoint(path):
+    """خواندن نقطه بازیابی ذخیره‌شده با save_checkpoint"""
+    with open(path, 'rb') as file:
+        payload = pickle.load(file)
+    if payload.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"نسخه نقطه بازیابی '{path}' پشتیبانی نمی‌شود")
+    return payload
@@ -0,0 +1,150 @@
+import heapq
+from collections import defaultdict, Counter
+
+from cow import CowList
+from time_tables import maintenance_blocks
+
+
+class ColoringInitializer:
+    """
+    سازنده حریصانه زمان‌بندی با رنگ‌آمیزی گراف تداخل به روش DSATUR
+
+    ابتدا برای هر درس استاد (با جنسیت سازگار) و مکان (با توازن استفاده) انتخاب
+    می‌شود. هر استاد، هر مکان و هر گروه concurrent_courses یک «منبع» با ظرفیت
+    (1 یا max_concurrent) در هر (روز، اسلات) است و دروس هم‌منبع در گراف تداخل
+    مجاورند. رنگ‌ها (روز، اسلات)ها هستند: در هر گام درس با بیشترین اشباع (تعداد
+    رنگ‌های پرشده در منابع آن) و سپس بیشترین درجه رنگ می‌شود و شکستن تساوی‌ها
+    و انتخاب رنگ از میان رنگ‌های آزاد تصادفی است تا افراد جمعیت متنوع باشند.
+    زمان‌های عدم حضور استاد و روزهای تعمیر مکان از رنگ‌های مجاز حذف می‌شوند.
+
+    هزینه هر ساخت O((دروس + یال‌ها) log دروس) است و fix_schedule_conflicts لازم نیست.
+    """
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.colors = list(scheduler.slot_keys)
+        self.blocked_places = maintenance_blocks(scheduler.constraints, len(scheduler.days))
+        self.allowed_cache = {}
+        # درس -> فهرست (منبع گروه، حداکثر هم‌زمانی)
+        self.groups_of = defaultdict(list)
+        for k, constraint in enumerate(scheduler.constraints):
+            if constraint.get('type') == 'concurrent_courses':
+                for code in set(constraint['course_codes']):
+                    self.groups_of[code].append((('group', k), constraint['max_concurrent']))
+
+    def build(self):
+        """ساخت یک زمان‌بندی (راه‌حل با هزینه inf)"""
+        scheduler = self.scheduler
+        rng = scheduler.random
+        solution = {scheduler.SOLUTION_KEY: CowList(), 'cost': float('inf')}
+
+        # انتخاب استاد و مکان (مانند random_population: دروس با مکان‌های کمتر اول)
+        scheduler.place_usage.clear()
+        courses = []
+        for course in sorted(scheduler.course_list, key=lambda c: len(c['suitable_places'])):
+            teachers = scheduler.compatible_teachers(course)
+            place = scheduler.select_balanced_place_for_course(course, solution)
+            if not teachers or not place:
+                continue
+            scheduler.place_usage[place['code']] += 1
+            courses.append({
+                'course_code': course['code'],
+                'teacher_code': rng.choice(teachers),
+                'place_code': place['code'],
+                'slot_id': None,
+                'day': None
+            })
+
+        # منابع هر درس و اعضای هر منبع
+        resources = []
+        capacity = {}
+        members = defaultdict(list)
+        for i, course in enumerate(courses):
+            own = [('teacher', course['teacher_code']), ('place', course['place_code'])]
+            for resource, max_concurrent in self.groups_of.get(course['course_code'], ()):
+                capacity[resource] = max_concurrent
+                own.append(resource)
+            for resource in own:
+                members[resource].append(i)
+            resources.append(own)
+
+        usage = defaultdict(Counter)   # منبع -> (روز، اسلات) -> تعداد
+        saturation = [set() for _ in courses]
+        degree = [sum(len(members[r]) - 1 for r in own) for own in resources]
+        colored = [None] * len(courses)
+
+        heap = [(0, -degree[i], rng.random(), i) for i in range(len(courses))]
+        heapq.heapify(heap)
+        while heap:
+            neg_saturation, _, _, i = heapq.heappop(heap)
+            if colored[i] is not None or -neg_saturation != len(saturation[i]):
+                continue  # مدخل کهنه
+            color = self.choose_color(courses[i], resources[i], saturation[i], usage, capacity)
+            colored[i] = color
+            courses[i]['day'], courses[i]['slot_id'] = color
+
+            # به‌روزرسانی اشباع همسایه‌هایی که این رنگ در منبع مشترکشان پر شده است
+            for resource in resources[i]:
+                usage[resource][color] += 1
+                if usage[resource][color] < capacity.get(resource, 1):
+                    continue
+                for j in members[resource]:
+                    if colored[j] is None and color not in saturation[j]:
+                        saturation[j].add(color)
+                        heapq.heappush(heap, (-len(saturation[j]), -degree[j], rng.random(), j))
+
+        for course in courses:
+            solution[scheduler.SOLUTION_KEY].append(course)
+        return solution
+
+    def allowed_colors(self, teacher, place):
+        """(روز، اسلات)های خارج از عدم حضور استاد و تعمیرات مکان (با کش)"""
+        key = (teacher, place)
+        allowed = self.allowed_cache.get(key)
+        if allowed is None:
+            blocked = self.scheduler.feasibility.blocked_keys.get(teacher, frozenset())
+            allowed = [
+                color for color in self.colors
+                if color not in blocked and not self.blocked_places.get((place, color[0]), 0)
+            ] or self.colors
+            self.allowed_cache[key] = allowed
+        return allowed
+    
+    def choose_color(self, course, resources, saturation, usage, capacity):
+        """
+        رنگ تصادفی از میان (روز، اسلات)های آزاد و مجاز درس
+
+        اگر رنگ آزادی نباشد، مکان‌های مناسب دیگر (کم‌استفاده‌تر اول) امتحان می‌شوند
+        و در صورت یافتن رنگ آزاد، مکان درس عوض می‌شود. در غیر این صورت رنگ مجاز با
+        کمترین اشغال منابع (کمترین تداخل) انتخاب می‌شود.
+        """
+        rng = self.scheduler.random
+        teacher = course['teacher_code']
+        allowed = self.allowed_colors(teacher, course['place_code'])
+        free = [color for color in allowed if color not in saturation]
+        if free:
+            return rng.choice(free)
+
+        place_usage = self.scheduler.place_usage
+        alternatives = sorted(
+            (p['code'] for p in self.scheduler.courses[course['course_code']]['suitable_places']
+             if p['code'] != course['place_code']),
+            key=lambda code: place_usage[code]
+        )
+        others = [r for r in resources if r[0] != 'place']
+        for place in alternatives:
+            candidate = others + [('place', place)]
+            free = [
+                color for color in self.allowed_colors(teacher, place)
+                if all(usage[r][color] < capacity.get(r, 1) for r in candidate)
+            ]
+            if free:
+                place_usage[course['place_code']] -= 1
+                place_usage[place] += 1
+                course['place_code'] = place
+                resources[:] = candidate
+                return rng.choice(free)
+
+        load = {color: sum(usage[r][color] for r in resources) for color in allowed}
+        least = min(load.values())
+        return rng.choice([color for color in allowed if load[color] == least])
@@ -0,0 +1,309 @@
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from feasibility import teacher_unavailable_matrix
+from time_tables import slot_start_minutes, close_slots, maintenance_blocks
+
+# نوع محدودیت در config.yaml -> کلاس کرنل آن
+CONSTRAINT_KERNELS = {}
+
+
+def register_constraint(type_name):
+    """ثبت یک کلاس کرنل برای نوع محدودیت type_name در رجیستری"""
+    def decorator(cls):
+        cls.type_name = type_name
+        CONSTRAINT_KERNELS[type_name] = cls
+        return cls
+    return decorator
+
+
+class ConstraintContext:
+    """داده‌های ایستای مسئله که کرنل‌ها هنگام کامپایل به آن‌ها نیاز دارند"""
+
+    def __init__(self, index, teachers, time_slots):
+        self.index = index
+        self.teachers = teachers
+        self.time_slots = time_slots
+        self.num_days = index.num_days
+        self.num_slots = len(index.slot_ids)
+        self.slot_minutes = slot_start_minutes(time_slots)
+
+
+class BatchView:
+    """
+    نمای آرایه‌ای جمعیت فشرده برای فرم دسته‌ای کرنل‌ها
+
+    آرایه‌ها (جمعیت × دروس) هستند و یک بار برای هر فراخوانی ارزیاب ساخته می‌شوند.
+    """
+
+    def __init__(self, genes_teacher, genes_place, genes_slot, genes_day, course_order, num_slots):
+        self.teacher = genes_teacher
+        self.place = genes_place
+        self.slot = genes_slot
+        self.day = genes_day
+        self.course_order = course_order
+        self.pop = genes_teacher.shape[0]
+        self.day_slot = genes_day * num_slots + genes_slot
+        self.offsets = np.arange(self.pop, dtype=np.int64)[:, None]
+
+
+class ConstraintKernel:
+    """
+    پایه کرنل‌های محدودیت
+
+    هر کرنل همه محدودیت‌های یک نوع را یک بار کامپایل می‌کند و سه فرم هم‌ارز
+    ارائه می‌دهد که همه تعداد نقض را برمی‌گردانند (ضریب هزینه با cost_option):
+        scalar(position): برای یک زمان‌بندی دیکشنری
+        add/remove(state, code, assignment): تغییر تعداد نقض با افزودن/حذف یک تخصیص
+        batch(view): آرایه تعداد نقض برای کل جمعیت فشرده
+    assignment تاپل (استاد، مکان، اسلات، روز) است، مانند DeltaCostModel.
+    """
+
+    type_name = None
+    cost_option = None
+    description = ''
+
+    def __init__(self, constraints, context):
+        self.constraints = constraints
+        self.context = context
+
+    def new_state(self):
+        """وضعیت افزایشی خالی برای یک راه‌حل"""
+        return None
+
+    def scalar(self, position):
+        state = self.new_state()
+        return sum(self.add(state, c['course_code'], self._assignment(c)) for c in position)
+
+    def add(self, state, code, assignment):
+        raise NotImplementedError
+
+    def remove(self, state, code, assignment):
+        raise NotImplementedError
+
+    def batch(self, view):
+        raise NotImplementedError
+
+    def touches(self, code, teacher):
+        """آیا تخصیص این درس/استاد ممکن است روی این کرنل اثر داشته باشد"""
+        return True
+
+    @staticmethod
+    def _assignment(course):
+        return (course['teacher_code'], course['place_code'], course['slot_id'], course['day'])
+
+
+@register_constraint('teacher_unavailable')
+class TeacherUnavailableKernel(ConstraintKernel):
+    """کلاس در زمان عدم حضور استاد (محدودیت‌ها و unavailable_times اساتید)"""
+
+    cost_option = 'teacher_unavailable_cost'
+    description = 'کلاس در زمان عدم حضور استاد'
+
+    def __init__(self, constraints, context):
+        super().__init__(constraints, context)
+        index = context.index
+        teachers = [dict(context.teachers[code], code=code) for code in index.teacher_codes]
+        self.blocked = teacher_unavailable_matrix(teachers, constraints, context.num_days, index.slot_ids)
+        self.blocked_keys = set()
+        for t, days, slots in zip(*np.nonzero(self.blocked)):
+            self.blocked_keys.add((index.teacher_codes[t], int(days) + 1, index.slot_ids[slots]))
+        self.teacher_codes = {key[0] for key in self.blocked_keys}
+
+    def add(self, state, code, assignment):
+        teacher, _, slot, day = assignment
+        return int((teacher, day, slot) in self.blocked_keys)
+
+    def remove(self, state, code, assignment):
+        return self.add(state, code, assignment)
+
+    def batch(self, view):
+        return self.blocked[view.teacher, view.day, view.slot].sum(axis=1)
+
+    def touches(self, code, teacher):
+        return teacher in self.teacher_codes
+
+
+@register_constraint('place_maintenance')
+class PlaceMaintenanceKernel(ConstraintKernel):
+    """کلاس در مکانی که در آن روز در حال تعمیر است"""
+
+    cost_option = 'maintenance_cost'
+    description = 'نقض تعمیرات مکان'
+
+    def __init__(self, constraints, context):
+        super().__init__(constraints, context)
+        index = context.index
+        self.blocked = maintenance_blocks(constraints, context.num_days)
+        self.table = np.zeros((len(index.place_codes), context.num_days), dtype=np.int64)
+        for (place_code, day), count in self.blocked.items():
+            if place_code in index.place_index:
+                self.table[index.place_index[place_code], day - 1] += count
+
+    def add(self, state, code, assignment):
+        _, place, _, day = assignment
+        return self.blocked.get((place, day), 0)
+
+    def remove(self, state, code, assignment):
+        return self.add(state, code, assignment)
+
+    def batch(self, view):
+        return self.table[view.place, view.day].sum(axis=1)
+
+
+@register_constraint('concurrent_courses')
+class ConcurrentCoursesKernel(ConstraintKernel):
+    """بیش از max_concurrent درس از یک گروه در یک (روز، اسلات)"""
+
+    cost_option = 'concurrent_cost'
+    description = 'تداخل دروس همزمان'
+
+    def __init__(self, constraints, context):
+        super().__init__(constraints, context)
+        index = context.index
+        # درس -> فهرست (شماره گروه، حداکثر مجاز)
+        self.groups_of = defaultdict(list)
+        self.groups = []
+        for k, constraint in enumerate(constraints):
+            members = set(constraint['course_codes'])
+            for code in members:
+                self.groups_of[code].append((k, constraint['max_concurrent']))
+            member_idx = np.array(
+                [index.course_index[c] for c in members if c in index.course_index], dtype=np.int64
+            )
+            self.groups.append((member_idx, constraint['max_concurrent']))
+        self._members = {}
+
+    def new_state(self):
+        return defaultdict(Counter)
+
+    def add(self, state, code, assignment):
+        _, _, slot, day = assignment
+        excess = 0
+        for k, max_concurrent in self.groups_of.get(code, ()):
+            count = state[k][(day, slot)]
+            if count >= max_concurrent:
+                excess += 1
+            state[k][(day, slot)] = count + 1
+        return excess
+
+    def remove(self, state, code, assignment):
+        _, _, slot, day = assignment
+        excess = 0
+        for k, max_concurrent in self.groups_of.get(code, ()):
+            count = state[k][(day, slot)] - 1
+            state[k][(day, slot)] = count
+            if count >= max_concurrent:
+                excess += 1
+        return excess
+
+    def batch(self, view):
+        num_day_slots = self.context.num_days * self.context.num_slots
+        excess = np.zeros(view.pop, dtype=np.int64)
+        for members, max_concurrent in self._member_positions(view.course_order):
+            if not len(members):
+                continue
+            keys = (view.offsets * num_day_slots + view.day_slot[:, members]).ravel()
+            counts = np.bincount(keys, minlength=view.pop * num_day_slots).reshape(view.pop, num_day_slots)
+            excess += np.maximum(counts - max_concurrent, 0).sum(axis=1)
+        return excess
+
+    def touches(self, code, teacher):
+        return code in self.groups_of
+
+    def _member_positions(self, course_order):
+        """موقعیت اعضای هر گروه در ترتیب دروس جمعیت (با کش)"""
+        key = course_order.tobytes()
+        cached = self._members.get(key)
+        if cached is None:
+            cached = [
+                (np.flatnonzero(np.isin(course_order, member_idx)), max_concurrent)
+                for member_idx, max_concurrent in self.groups
+            ]
+            self._members[key] = cached
+        return cached
+
+
+@register_constraint('same_teacher_courses')
+class SameTeacherGapKernel(ConstraintKernel):
+    """جفت کلاس‌های هم‌روز یک استاد با فاصله شروع کمتر از min_hours_between"""
+
+    cost_option = 'teacher_gap_cost'
+    description = 'عدم رعایت فاصله زمانی استاد'
+
+    def __init__(self, constraints, context):
+        super().__init__(constraints, context)
+        index = context.index
+        minutes = context.slot_minutes
+        # استاد -> فهرست نگاشت اسلات -> اسلات‌های نزدیک
+        self.close_of = defaultdict(list)
+        self.matrices = []
+        for constraint in constraints:
+            close = close_slots(minutes, constraint['min_hours_between'])
+            self.close_of[constraint['teacher_code']].append(close)
+            if constraint['teacher_code'] in index.teacher_index:
+                matrix = np.array(
+                    [[s2 in close[s1] for s2 in index.slot_ids] for s1 in index.slot_ids], dtype=np.int64
+                )
+                self.matrices.append((index.teacher_index[constraint['teacher_code']], matrix))
+
+    def new_state(self):
+        return Counter()
+
+    def add(self, state, code, assignment):
+        teacher, _, slot, day = assignment
+        if teacher not in self.close_of:
+            return 0
+        pairs = self._pairs(state, teacher, day, slot)
+        state[(teacher, day, slot)] += 1
+        return pairs
+
+    def remove(self, state, code, assignment):
+        teacher, _, slot, day = assignment
+        if teacher not in self.close_of:
+            return 0
+        state[(teacher, day, slot)] -= 1
+        return self._pairs(state, teacher, day, slot)
+
+    def _pairs(self, state, teacher, day, slot):
+        pairs = 0
+        for close in self.close_of[teacher]:
+            for other_slot in close[slot]:
+                pairs += state[(teacher, day, other_slot)]
+        return pairs
+
+    def batch(self, view):
+        num_days, num_slots = self.context.num_days, self.context.num_slots
+        num_day_slots = num_days * num_slots
+        pairs = np.zeros(view.pop, dtype=np.int64)
+        keys_all = (view.offsets * num_day_slots + view.day_slot).ravel()
+        for teacher_idx, close in self.matrices:
+            keys = keys_all[(view.teacher == teacher_idx).ravel()]
+            counts = np.bincount(keys, minlength=view.pop * num_day_slots)
+            counts = counts.reshape(view.pop, num_days, num_slots)
+            pair_sum = np.einsum('pds,st,pdt->p', counts, close, counts)
+            pairs += (pair_sum - (counts * np.diag(close)).sum(axis=(1, 2))) // 2
+        return pairs
+
+    def touches(self, code, teacher):
+        return teacher in self.close_of
+
+
+def compile_constraint_kernels(constraints, index, teachers, time_slots):
+    """
+    کامپایل یک‌باره بخش constraints به فهرست کرنل‌ها (یک کرنل برای هر نوع ثبت‌شده)
+
+    teacher_unavailable همیشه ساخته می‌شود، چون unavailable_times اساتید هم
+    بدون محدودیت صریح در آن شمرده می‌شود. انواع ثبت‌نشده نادیده گرفته می‌شوند.
+    """
+    context = ConstraintContext(index, teachers, time_slots)
+    by_type = defaultdict(list)
+    for constraint in constraints:
+        by_type[constraint['type']].append(constraint)
+
+    kernels = []
+    for type_name, kernel_cls in CONSTRAINT_KERNELS.items():
+        if by_type.get(type_name) or type_name == 'teacher_unavailable':
+            kernels.append(kernel_cls(by_type.get(type_name, []), context))
+    return kernels
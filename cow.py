@@ -0,0 +1,81 @@
+class CowList:
+    """
+    فهرست کلاس‌های یک راه‌حل با اشتراک ساختاری (کپی هنگام نوشتن)
+
+    copy() فقط ارجاع به فهرست داخلی را به اشتراک می‌گذارد و O(1) است. دیکشنری
+    کلاس‌ها مقدار تغییرناپذیر فرض می‌شوند: هر تغییری باید از طریق mutable(j)
+    انجام شود که در صورت اشتراک، ابتدا فهرست و سپس همان یک کلاس را کپی می‌کند.
+    """
+
+    __slots__ = ('_items', '_shared', '_owned')
+
+    def __init__(self, items=()):
+        # عناصر ورودی متعلق به همین فهرست در نظر گرفته می‌شوند
+        self._items = list(items)
+        self._shared = False
+        self._owned = set(range(len(self._items)))
+
+    def copy(self):
+        """کپی O(1): هر دو طرف تا اولین نوشتن، فهرست و کلاس‌ها را به اشتراک می‌گذارند"""
+        other = CowList.__new__(CowList)
+        other._items = self._items
+        other._shared = True
+        other._owned = set()
+        self._shared = True
+        self._owned = set()
+        return other
+
+    def mutable(self, j):
+        """کلاس j به صورت قابل تغییر (در صورت اشتراک، کپی خصوصی ساخته می‌شود)"""
+        if j not in self._owned:
+            self._detach()
+            self._items[j] = dict(self._items[j])
+            self._owned.add(j)
+        return self._items[j]
+
+    def share(self, j):
+        """کلاس j برای قرار گرفتن در راه‌حل دیگر (مالکیت آن رها می‌شود)"""
+        self._owned.discard(j)
+        return self._items[j]
+
+    def append(self, course):
+        """افزودن یک کلاس تازه ساخته‌شده (مالکیت آن به فهرست منتقل می‌شود)"""
+        self._detach()
+        self._items.append(course)
+        self._owned.add(len(self._items) - 1)
+
+    def _detach(self):
+        """جدا کردن فهرست داخلی از نسخه‌های اشتراکی"""
+        if self._shared:
+            self._items = list(self._items)
+            self._shared = False
+
+    def __setitem__(self, j, course):
+        self._detach()
+        self._items[j] = course
+        self._owned.discard(j)
+
+    def __getitem__(self, j):
+        return self._items[j]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __eq__(self, other):
+        if isinstance(other, CowList):
+            other = other._items
+        return self._items == other
+
+    def __repr__(self):
+        return f"CowList({self._items!r})"
+
+    def __getstate__(self):
+        return (list(self._items),)
+
+    def __setstate__(self, state):
+        self._items = list(state[0])
+        self._shared = False
+        self._owned = set(range(len(self._items)))
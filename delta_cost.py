@@ -0,0 +1,355 @@
+from collections import defaultdict, Counter
+
+from constraints import compile_constraint_kernels
+
+
+class CostState:
+    """وضعیت شمارنده‌های اشغال یک راه‌حل برای محاسبه افزایشی هزینه"""
+
+    def __init__(self, codes, kernels):
+        self.codes = codes                      # کد درس در هر موقعیت
+        self.index_of = {}                      # کد درس -> موقعیت (اولین رخداد)
+        for i, code in enumerate(codes):
+            self.index_of.setdefault(code, i)
+        self.assign = [None] * len(codes)       # (استاد، مکان، اسلات، روز) هر درس
+
+        self.teacher_slots = Counter()          # (استاد، روز، اسلات) -> تعداد
+        self.place_slots = Counter()            # (مکان، روز، اسلات) -> تعداد
+        self.teacher_load = defaultdict(lambda: [0, 0])  # استاد -> [تعداد کلاس، مجموع واحد]
+        self.place_usage = Counter()            # مکان -> تعداد کلاس
+        self.usage_hist = Counter()             # تعداد استفاده -> تعداد مکان‌ها
+        self.slot_genders = defaultdict(Counter)  # (روز، اسلات، مکان) -> شمارش جنسیت‌ها
+        self.kernel_states = [k.new_state() for k in kernels]  # وضعیت هر کرنل محدودیت
+
+        # تعداد نقض‌ها به تفکیک جمله هزینه
+        self.teacher_conflicts = 0
+        self.place_conflicts = 0
+        self.workload = 0
+        self.capacity = 0
+        self.prereq = 0
+        self.coreq = 0
+        self.gender = 0
+        self.gender_clash = 0
+        self.kernel_violations = [0] * len(kernels)
+
+
+class DeltaCostModel:
+    """
+    موتور محاسبه افزایشی هزینه
+
+    داده‌های مسئله یک بار کامپایل می‌شوند و برای هر راه‌حل یک CostState
+    نگه داشته می‌شود؛ تغییر یک تخصیص تنها شمارنده‌های مربوط به همان درس را
+    به‌روز می‌کند و تفاوت هزینه در O(درجه) به دست می‌آید.
+    """
+
+    def __init__(self, scheduler):
+        self.courses = scheduler.courses
+        self.teachers = scheduler.teachers
+        self.places = scheduler.places
+        self.options = scheduler.OPTIONS
+        self.max_place_usage = scheduler.max_place_usage
+        self.prerequisites = scheduler.prerequisites
+        self.corequisites = scheduler.corequisites
+
+        # اطلاعات ایستای دروس، اساتید و مکان‌ها به صورت تاپل برای دسترسی سریع
+        self.course_info = {
+            code: (c.get('units', 0), c.get('gender', 0), c.get('expected_students', 30))
+            for code, c in self.courses.items()
+        }
+        self.teacher_info = {
+            code: (t['min_units'], t['max_units'], t.get('gender', 0))
+            for code, t in self.teachers.items()
+        }
+        self.place_info = {
+            code: (p['capacity'], p.get('gender', 0))
+            for code, p in self.places.items()
+        }
+        self.static_cache = {}
+
+        # وابستگی‌های معکوس: درس -> دروسی که آن را پیش‌نیاز/هم‌نیاز دارند
+        self.dependents = defaultdict(set)
+        for code, prereqs in self.prerequisites.items():
+            for prereq in prereqs:
+                self.dependents[prereq].add(code)
+        for code, coreqs in self.corequisites.items():
+            for coreq in coreqs:
+                self.dependents[coreq].add(code)
+        # دروسی که جابه‌جایی آن‌ها روی پیش‌نیاز/هم‌نیاز اثر دارد
+        self.requisite_codes = (
+            {code for code, reqs in self.prerequisites.items() if reqs} |
+            {code for code, reqs in self.corequisites.items() if reqs} |
+            set(self.dependents)
+        )
+
+        self.compile_constraints(scheduler)
+
+    def compile_constraints(self, scheduler):
+        """کامپایل یک‌باره بخش constraints به کرنل‌های محدودیت (فرم افزایشی آن‌ها استفاده می‌شود)"""
+        self.kernels = compile_constraint_kernels(
+            scheduler.constraints, scheduler.index, scheduler.teachers, scheduler.time_slots
+        )
+
+    def new_state(self, position):
+        """ساخت وضعیت شمارنده‌ها برای یک راه‌حل کامل"""
+        state = CostState([c['course_code'] for c in position], self.kernels)
+        for i, course in enumerate(position):
+            self._add(state, i, self.assignment_of(course))
+        state.prereq = sum(self._prereq_violations(state, i) for i in range(len(position)))
+        state.coreq = sum(self._coreq_violations(state, i) for i in range(len(position)))
+        return state
+
+    def rebuild(self, state, position):
+        """بازسازی کامل شمارنده‌های یک وضعیت موجود"""
+        state.__dict__.update(self.new_state(position).__dict__)
+
+    @staticmethod
+    def assignment_of(course):
+        """تبدیل دیکشنری کلاس به تاپل (استاد، مکان، اسلات، روز)"""
+        return (course['teacher_code'], course['place_code'], course['slot_id'], course['day'])
+
+    def total(self, state):
+        """هزینه کل راه‌حل از روی شمارنده‌ها"""
+        opts = self.options
+        cost = 0
+        cost += state.teacher_conflicts * opts['teacher_conflict_cost']
+        cost += state.place_conflicts * opts['place_conflict_cost']
+        cost += state.workload * opts['workload_cost']
+        cost += state.capacity * opts['capacity_cost']
+        cost += state.prereq * opts['prereq_cost']
+        cost += state.coreq * opts['coreq_cost']
+        for kernel, violations in zip(self.kernels, state.kernel_violations):
+            cost += violations * opts[kernel.cost_option]
+        cost += self._usage_cost(state)
+        cost += (state.gender + state.gender_clash) * opts['gender_mismatch_cost']
+        return cost
+
+    def _usage_cost(self, state):
+        """هزینه عدم توازن و استفاده بیش از حد مکان‌ها از روی هیستوگرام استفاده"""
+        if not state.usage_hist:
+            return 0
+        counts = state.usage_hist.keys()
+        cost = (max(counts) - min(counts)) * self.options['place_usage_cost']
+
+        avg_usage = sum(k * n for k, n in state.usage_hist.items()) / sum(state.usage_hist.values())
+        for count, n in state.usage_hist.items():
+            if count > avg_usage * 1.5 or count > self.max_place_usage:
+                cost += n * (count - avg_usage) * self.options['place_overuse_cost']
+        return cost
+
+    def apply(self, state, i, assignment):
+        """اعمال تغییر تخصیص درس i و به‌روزرسانی شمارنده‌ها"""
+        old = state.assign[i]
+        if old == assignment:
+            return
+        if state.codes[i] not in self.requisite_codes:
+            self._remove(state, i, old)
+            self._add(state, i, assignment)
+            return
+
+        affected = self._affected(state, i)
+        state.prereq -= sum(self._prereq_violations(state, j) for j in affected)
+        state.coreq -= sum(self._coreq_violations(state, j) for j in affected)
+
+        self._remove(state, i, old)
+        self._add(state, i, assignment)
+
+        state.prereq += sum(self._prereq_violations(state, j) for j in affected)
+        state.coreq += sum(self._coreq_violations(state, j) for j in affected)
+
+    def delta(self, state, i, assignment):
+        """تفاوت هزینه در صورت تغییر تخصیص درس i (بدون تغییر وضعیت)"""
+        old = state.assign[i]
+        before = self.total(state)
+        self.apply(state, i, assignment)
+        after = self.total(state)
+        self.apply(state, i, old)
+        return after - before
+
+    def sync(self, state, position):
+        """
+        هم‌گام‌سازی وضعیت با موقعیت فعلی و بازگرداندن هزینه کل
+
+        اگر بیش از نیمی از تخصیص‌ها تغییر کرده باشند، بازسازی کامل ارزان‌تر
+        از اعمال تک‌تک تغییرات است.
+        """
+        changes = []
+        for i, course in enumerate(position):
+            assignment = self.assignment_of(course)
+            if assignment != state.assign[i]:
+                changes.append((i, assignment))
+
+        if len(changes) * 2 > len(position):
+            self.rebuild(state, position)
+        else:
+            for i, assignment in changes:
+                self.apply(state, i, assignment)
+        return self.total(state)
+
+    def _affected(self, state, i):
+        """موقعیت‌هایی که نقض پیش‌نیاز/هم‌نیاز آن‌ها به درس i وابسته است"""
+        affected = {i}
+        for code in self.dependents.get(state.codes[i], ()):
+            j = state.index_of.get(code)
+            if j is not None:
+                affected.add(j)
+        return affected
+
+    def _prereq_violations(self, state, i):
+        """تعداد پیش‌نیازهای برآورده‌نشده درس i"""
+        _, _, slot, day = state.assign[i]
+        violations = 0
+        for prereq in self.prerequisites.get(state.codes[i], []):
+            j = state.index_of.get(prereq)
+            if j is None:
+                violations += 1
+                continue
+            _, _, other_slot, other_day = state.assign[j]
+            if not (other_day < day or (other_day == day and other_slot < slot)):
+                violations += 1
+        return violations
+
+    def _coreq_violations(self, state, i):
+        """تعداد هم‌نیازهای برآورده‌نشده درس i"""
+        _, _, slot, day = state.assign[i]
+        violations = 0
+        for coreq in self.corequisites.get(state.codes[i], []):
+            j = state.index_of.get(coreq)
+            if j is None:
+                violations += 1
+                continue
+            _, _, other_slot, other_day = state.assign[j]
+            if not (other_day == day and abs(other_slot - slot) <= 1):
+                violations += 1
+        return violations
+
+    def _static_violations(self, code, teacher, place):
+        """نقض‌های ایستای یک تخصیص: (ظرفیت، عدم تطابق جنسیت)"""
+        key = (code, teacher, place)
+        cached = self.static_cache.get(key)
+        if cached is not None:
+            return cached
+
+        _, course_gender, expected_students = self.course_info[code]
+        capacity, place_gender = self.place_info[place]
+        gender = 0
+        if course_gender != 0:
+            if place_gender != 0 and place_gender != course_gender:
+                gender += 1
+            if self.teacher_info[teacher][2] != course_gender:
+                gender += 1
+        cached = (int(capacity < expected_students), gender)
+        self.static_cache[key] = cached
+        return cached
+
+    def _workload_violation(self, teacher, units):
+        """آیا مجموع واحدهای استاد خارج از بازه مجاز است"""
+        min_units, max_units, _ = self.teacher_info[teacher]
+        return int(units < min_units or units > max_units)
+
+    def _add(self, state, i, assignment):
+        """افزودن یک تخصیص به شمارنده‌ها"""
+        teacher, place, slot, day = assignment
+        code = state.codes[i]
+        units, course_gender, _ = self.course_info[code]
+        state.assign[i] = assignment
+
+        # تداخل استاد و مکان
+        key = (teacher, day, slot)
+        count = state.teacher_slots[key]
+        if count > 0:
+            state.teacher_conflicts += 1
+        state.teacher_slots[key] = count + 1
+        key = (place, day, slot)
+        count = state.place_slots[key]
+        if count > 0:
+            state.place_conflicts += 1
+        state.place_slots[key] = count + 1
+
+        # بار کاری استاد
+        load = state.teacher_load[teacher]
+        if load[0] > 0:
+            state.workload -= self._workload_violation(teacher, load[1])
+        load[0] += 1
+        load[1] += units
+        state.workload += self._workload_violation(teacher, load[1])
+
+        # استفاده از مکان
+        usage = state.place_usage[place]
+        if usage > 0:
+            self._hist_remove(state, usage)
+        state.place_usage[place] = usage + 1
+        state.usage_hist[usage + 1] += 1
+
+        # جملات ایستا: ظرفیت، جنسیت
+        capacity, gender = self._static_violations(code, teacher, place)
+        state.capacity += capacity
+        state.gender += gender
+
+        if course_gender != 0:
+            genders = state.slot_genders[(day, slot, place)]
+            clash_before = len(genders) > 1
+            genders[course_gender] += 1
+            state.gender_clash += (len(genders) > 1) - clash_before
+
+        # کرنل‌های محدودیت (تعمیرات، دروس همزمان، فاصله استاد، عدم حضور استاد)
+        for k, kernel in enumerate(self.kernels):
+            state.kernel_violations[k] += kernel.add(state.kernel_states[k], code, assignment)
+
+    def _remove(self, state, i, assignment):
+        """حذف یک تخصیص از شمارنده‌ها"""
+        teacher, place, slot, day = assignment
+        code = state.codes[i]
+        units, course_gender, _ = self.course_info[code]
+
+        # تداخل استاد و مکان
+        key = (teacher, day, slot)
+        count = state.teacher_slots[key] - 1
+        if count > 0:
+            state.teacher_conflicts -= 1
+        state.teacher_slots[key] = count
+        key = (place, day, slot)
+        count = state.place_slots[key] - 1
+        if count > 0:
+            state.place_conflicts -= 1
+        state.place_slots[key] = count
+
+        # بار کاری استاد
+        load = state.teacher_load[teacher]
+        state.workload -= self._workload_violation(teacher, load[1])
+        load[0] -= 1
+        load[1] -= units
+        if load[0] > 0:
+            state.workload += self._workload_violation(teacher, load[1])
+
+        # استفاده از مکان
+        usage = state.place_usage[place]
+        self._hist_remove(state, usage)
+        if usage > 1:
+            state.usage_hist[usage - 1] += 1
+            state.place_usage[place] = usage - 1
+        else:
+            del state.place_usage[place]
+
+        # جملات ایستا: ظرفیت، جنسیت
+        capacity, gender = self._static_violations(code, teacher, place)
+        state.capacity -= capacity
+        state.gender -= gender
+
+        if course_gender != 0:
+            genders = state.slot_genders[(day, slot, place)]
+            clash_before = len(genders) > 1
+            genders[course_gender] -= 1
+            if genders[course_gender] == 0:
+                del genders[course_gender]
+            state.gender_clash += (len(genders) > 1) - clash_before
+
+        # کرنل‌های محدودیت
+        for k, kernel in enumerate(self.kernels):
+            state.kernel_violations[k] -= kernel.remove(state.kernel_states[k], code, assignment)
+
+    @staticmethod
+    def _hist_remove(state, usage):
+        """کاهش یک مکان از هیستوگرام استفاده"""
+        state.usage_hist[usage] -= 1
+        if state.usage_hist[usage] == 0:
+            del state.usage_hist[usage]
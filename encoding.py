@@ -0,0 +1,138 @@
+import numpy as np
+
+# ستون‌های آرایه ژن‌ها
+TEACHER, PLACE, SLOT, DAY = range(4)
+
+
+class ProblemIndex:
+    """جداول نگاشت کدهای رشته‌ای به اندیس‌های صحیح (یک بار برای هر مسئله)"""
+
+    def __init__(self, courses, teachers, places, time_slots, days):
+        self.course_codes = list(courses)
+        self.teacher_codes = list(teachers)
+        self.place_codes = list(places)
+        self.slot_ids = list(time_slots)
+        self.num_days = len(days)
+
+        self.course_index = {code: i for i, code in enumerate(self.course_codes)}
+        self.teacher_index = {code: i for i, code in enumerate(self.teacher_codes)}
+        self.place_index = {code: i for i, code in enumerate(self.place_codes)}
+        self.slot_index = {slot_id: i for i, slot_id in enumerate(self.slot_ids)}
+
+    @classmethod
+    def from_config(cls, config):
+        """ساخت جداول مستقیماً از محتوای config.yaml"""
+        return cls(
+            {c['code']: c for c in config['courses']},
+            {t['code']: t for t in config['teachers']},
+            {p['code']: p for p in config['places']},
+            {ts['id']: ts for ts in config['settings']['time_slots']},
+            config['settings']['days_of_week']
+        )
+
+    def encode_course(self, course):
+        """تبدیل دیکشنری کلاس به ژن (استاد، مکان، اسلات، روز)"""
+        return (
+            self.teacher_index[course['teacher_code']],
+            self.place_index[course['place_code']],
+            self.slot_index[course['slot_id']],
+            course['day'] - 1
+        )
+
+    def decode_course(self, course_idx, gene):
+        """تبدیل ژن به دیکشنری کلاس با قالب قبلی"""
+        return {
+            'course_code': self.course_codes[course_idx],
+            'teacher_code': self.teacher_codes[gene[TEACHER]],
+            'place_code': self.place_codes[gene[PLACE]],
+            'slot_id': self.slot_ids[gene[SLOT]],
+            'day': int(gene[DAY]) + 1
+        }
+
+
+class EncodedPopulation:
+    """
+    ذخیره فشرده جمعیت به صورت آرایه int32 با ابعاد (جمعیت × دروس × 4)
+
+    ترتیب دروس (محور دوم) برای همه افراد یکسان است و در course_order
+    نگه داشته می‌شود؛ هزینه‌ها در آرایه جداگانه costs قرار دارند.
+
+    این ساختار قالب تبادل است، نه جمعیت زنده: حلقه‌های BBO و GWO همچنان روی
+    فهرست دیکشنری کلاس‌ها (CowList) کار می‌کنند، چون اصلاح، جستجوی محلی و
+    آغازگرها بر آن بنا شده‌اند. جمعیت فقط برای ارزیابی برداری، نقطه بازیابی و
+    خروجی npz کدگذاری می‌شود.
+    """
+
+    def __init__(self, index, course_order, genes, costs=None):
+        self.index = index
+        self.course_order = np.asarray(course_order, dtype=np.int32)
+        self.genes = np.asarray(genes, dtype=np.int32)
+        if costs is None:
+            costs = np.full(len(self.genes), np.inf)
+        self.costs = np.asarray(costs, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.genes)
+
+    @property
+    def nbytes(self):
+        return self.genes.nbytes + self.costs.nbytes + self.course_order.nbytes
+
+    @classmethod
+    def from_schedules(cls, index, schedules, key):
+        """
+        تبدیل فهرست زمان‌بندی‌های دیکشنری به جمعیت فشرده
+
+        پارامترها:
+            index (ProblemIndex): جداول نگاشت
+            schedules (list): فهرست زمان‌بندی‌ها (گرگ‌ها یا زیستگاه‌ها)
+            key (str): کلید فهرست کلاس‌ها ('position' یا 'courses')
+        """
+        if not schedules:
+            return cls(index, [], np.zeros((0, 0, 4), dtype=np.int32), [])
+
+        first_codes = [c['course_code'] for c in schedules[0][key]]
+        course_order = [index.course_index[code] for code in first_codes]
+        teacher_index, place_index, slot_index = index.teacher_index, index.place_index, index.slot_index
+
+        # یک فهرست تخت از ژن‌ها و یک تبدیل آرایه‌ای (بدون نوشتن خانه‌به‌خانه در آرایه)
+        flat = []
+        for schedule in schedules:
+            courses = schedule[key]
+            if [c['course_code'] for c in courses] != first_codes:
+                if len(courses) != len(first_codes):
+                    raise ValueError("همه زمان‌بندی‌ها باید تعداد کلاس یکسان داشته باشند")
+                raise ValueError("ترتیب دروس در زمان‌بندی‌ها یکسان نیست")
+            flat.extend(
+                (teacher_index[c['teacher_code']], place_index[c['place_code']],
+                 slot_index[c['slot_id']], c['day'] - 1)
+                for c in courses
+            )
+        genes = np.array(flat, dtype=np.int32).reshape(len(schedules), len(first_codes), 4)
+
+        costs = [schedule.get('cost', float('inf')) for schedule in schedules]
+        return cls(index, course_order, genes, costs)
+
+    def to_schedule(self, k, key):
+        """تبدیل فرد k به قالب دیکشنری (مثلاً برای save_schedule_to_file)"""
+        genes = self.genes[k].tolist()
+        return {
+            key: [
+                self.index.decode_course(course_idx, gene)
+                for course_idx, gene in zip(self.course_order.tolist(), genes)
+            ],
+            'cost': float(self.costs[k])
+        }
+
+    def to_schedules(self, key):
+        """تبدیل کل جمعیت به فهرست زمان‌بندی‌های دیکشنری"""
+        return [self.to_schedule(k, key) for k in range(len(self))]
+
+    def copy(self):
+        """کپی مستقل آرایه‌های جمعیت"""
+        return EncodedPopulation(self.index, self.course_order, self.genes.copy(), self.costs.copy())
+
+    def take(self, indices):
+        """انتخاب زیرمجموعه‌ای از افراد (مثلاً نخبه‌ها) به صورت آرایه‌ای"""
+        indices = np.asarray(indices)
+        return EncodedPopulation(self.index, self.course_order, self.genes[indices], self.costs[indices])
@@ -0,0 +1,176 @@
+import os
+import csv
+import json
+
+import numpy as np
+
+from encoding import TEACHER, PLACE, SLOT, DAY
+
+# ستون‌های خروجی سطری (CSV و JSON Lines)
+ROW_FIELDS = (
+    'course_code', 'course_name', 'teacher_code', 'teacher_name', 'place_code', 'place_name',
+    'capacity', 'day', 'day_name', 'slot_id', 'start', 'end', 'gender'
+)
+
+
+def schedule_rows(scheduler, solution):
+    """
+    مولد سطرهای تخت یک زمان‌بندی به ترتیب خود راه‌حل (بدون ساخت کپی مرتب‌شده)
+
+    هر سطر دیکشنری با کلیدهای ROW_FIELDS است؛ نام‌ها و زمان‌ها از جداول مسئله
+    خوانده می‌شوند.
+    """
+    for course in solution[scheduler.SOLUTION_KEY]:
+        course_info = scheduler.courses[course['course_code']]
+        place = scheduler.places[course['place_code']]
+        time_slot = scheduler.time_slots[course['slot_id']]
+        yield {
+            'course_code': course['course_code'],
+            'course_name': course_info['name'],
+            'teacher_code': course['teacher_code'],
+            'teacher_name': scheduler.teachers[course['teacher_code']]['full_name'],
+            'place_code': course['place_code'],
+            'place_name': place['name'],
+            'capacity': place['capacity'],
+            'day': course['day'],
+            'day_name': scheduler.days[course['day'] - 1],
+            'slot_id': course['slot_id'],
+            'start': time_slot['start'],
+            'end': time_slot['end'],
+            'gender': course_info.get('gender', 0)
+        }
+
+
+class ScheduleWriter:
+    """نویسنده جریانی سطرهای زمان‌بندی (هر سطر بلافاصله در فایل نوشته می‌شود)"""
+
+    def write_row(self, row):
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write_row(row)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvScheduleWriter(ScheduleWriter):
+    """نوشتن سطرها در فایل CSV با سرستون ROW_FIELDS"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=ROW_FIELDS, extrasaction='ignore')
+        self.writer.writeheader()
+
+    def write_row(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlScheduleWriter(ScheduleWriter):
+    """نوشتن هر سطر به صورت یک خط JSON"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write_row(self, row):
+        self.file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+def save_npz(scheduler, solution, path):
+    """
+    ذخیره ستونی زمان‌بندی در فایل .npz (بدون پیمایش سطری)
+
+    ستون‌های course، teacher، place و slot اندیس‌های int32 در فرهنگ‌های
+    course_codes، teacher_codes، place_codes و slot_ids هستند (کدگذاری فرهنگی سازگار
+    با Arrow/Parquet)؛ day یک‌مبناست و cost هزینه راه‌حل است.
+
+    np.savez پسوند .npz را به مسیر بدون آن اضافه می‌کند؛ مسیر واقعی فایل برگردانده می‌شود.
+    """
+    if not path.endswith('.npz'):
+        path += '.npz'
+    encoded = scheduler.encode_population([solution])
+    index = scheduler.index
+    genes = encoded.genes[0] if len(encoded) else np.zeros((0, 4), dtype=np.int32)
+    np.savez(
+        path,
+        course=encoded.course_order,
+        teacher=genes[:, TEACHER],
+        place=genes[:, PLACE],
+        slot=genes[:, SLOT],
+        day=genes[:, DAY] + 1,
+        cost=np.float64(solution.get('cost', float('inf'))),
+        course_codes=np.array(index.course_codes, dtype=str),
+        teacher_codes=np.array(index.teacher_codes, dtype=str),
+        place_codes=np.array(index.place_codes, dtype=str),
+        slot_ids=np.array(index.slot_ids)
+    )
+    return path
+
+
+def load_npz(path):
+    """بازخوانی فایل save_npz به فهرست کلاس‌ها با قالب دیکشنری راه‌حل و هزینه آن"""
+    with np.load(path) as data:
+        course_codes = data['course_codes'].tolist()
+        teacher_codes = data['teacher_codes'].tolist()
+        place_codes = data['place_codes'].tolist()
+        slot_ids = data['slot_ids'].tolist()
+        courses = [
+            {
+                'course_code': course_codes[c],
+                'teacher_code': teacher_codes[t],
+                'place_code': place_codes[p],
+                'slot_id': slot_ids[s],
+                'day': d
+            }
+            for c, t, p, s, d in zip(
+                data['course'].tolist(), data['teacher'].tolist(), data['place'].tolist(),
+                data['slot'].tolist(), data['day'].tolist()
+            )
+        ]
+        return courses, float(data['cost'])
+
+
+# قالب -> کلاس نویسنده سطری
+WRITERS = {
+    'csv': CsvScheduleWriter,
+    'jsonl': JsonlScheduleWriter
+}
+
+
+def export_schedule(scheduler, solution, path, fmt=None):
+    """
+    خروجی زمان‌بندی در قالب ماشین‌خوان یا گزارش متنی
+
+    پارامترها:
+        scheduler: زمان‌بند مالک جداول مسئله
+        solution (dict): راه‌حل
+        path (str): مسیر فایل خروجی
+        fmt (str): 'csv'، 'jsonl'، 'npz' یا 'text' (None = از پسوند فایل)
+
+    خروجی:
+        مسیر فایل نوشته‌شده (برای npz در صورت نبود پسوند، با .npz)
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt == 'npz':
+        return save_npz(scheduler, solution, path)
+    if fmt in ('text', 'txt'):
+        scheduler.save_schedule_to_file(solution, path)
+        return path
+    if fmt not in WRITERS:
+        raise ValueError(f"قالب خروجی ناشناخته: {fmt}")
+    with WRITERS[fmt](path) as writer:
+        writer.write_rows(schedule_rows(scheduler, solution))
+    return path
@@ -0,0 +1,131 @@
+import numpy as np
+
+
+def eligible_teacher_matrix(courses, teachers):
+    """
+    ماتریس درس×استاد مجاز: استاد درس را در فهرست courses خود دارد و جنسیت او
+    با جنسیت درس (در صورت تعیین) مطابقت دارد
+    """
+    matrix = np.zeros((len(courses), len(teachers)), dtype=bool)
+    for j, teacher in enumerate(teachers):
+        taught = set(teacher.get('courses', []) or [])
+        teacher_gender = teacher.get('gender', 0)
+        for i, course in enumerate(courses):
+            course_gender = course.get('gender', 0)
+            matrix[i, j] = course['code'] in taught and (course_gender == 0 or teacher_gender == course_gender)
+    return matrix
+
+
+def suitable_place_matrix(courses, places):
+    """ماتریس درس×مکان مناسب از نظر نوع، جنسیت و در دسترس بودن (یا required_place صریح)"""
+    matrix = np.zeros((len(courses), len(places)), dtype=bool)
+    for i, course in enumerate(courses):
+        required_type = course.get('required_place_type', 'کلاس تئوری')
+        required_place = course.get('required_place', None)
+        gender = course.get('gender', 0)
+        for j, place in enumerate(places):
+            if required_place:
+                matrix[i, j] = place['code'] in required_place.split(',')
+            else:
+                matrix[i, j] = bool(
+                    place['type'] == required_type and
+                    (gender == 0 or place['gender'] == 0 or place['gender'] == gender) and
+                    place['available']
+                )
+    return matrix
+
+
+def capacity_matrix(courses, places):
+    """ماتریس درس×مکان با ظرفیت کافی برای تعداد دانشجویان مورد انتظار"""
+    expected = np.array([c.get('expected_students', 30) for c in courses])
+    capacity = np.array([p['capacity'] for p in places])
+    return capacity[None, :] >= expected[:, None]
+
+
+def _unavailable_entries(teacher, constraints):
+    """(روز، اسلات)های ممنوع یک استاد از unavailable_times و محدودیت‌های teacher_unavailable"""
+    entries = list(teacher.get('unavailable_times', []) or [])
+    entries += [
+        c for c in constraints
+        if c.get('type') == 'teacher_unavailable' and c.get('teacher_code') == teacher['code']
+    ]
+    for entry in entries:
+        if isinstance(entry, dict):
+            slots = entry.get('time_slots', [entry.get('slot_id')])
+            for slot_id in slots:
+                yield entry.get('day'), slot_id
+        else:
+            day, slot_id = entry
+            yield day, slot_id
+
+
+def teacher_unavailable_matrix(teachers, constraints, num_days, slot_ids):
+    """آرایه استاد×روز×اسلات از زمان‌های عدم حضور اساتید (روز 0-مبنا)"""
+    slot_index = {slot_id: k for k, slot_id in enumerate(slot_ids)}
+    matrix = np.zeros((len(teachers), num_days, len(slot_ids)), dtype=bool)
+    for t, teacher in enumerate(teachers):
+        for day, slot_id in _unavailable_entries(teacher, constraints):
+            if day is not None and 1 <= day <= num_days and slot_id in slot_index:
+                matrix[t, day - 1, slot_index[slot_id]] = True
+    return matrix
+
+
+def compile_feasibility(config, index):
+    """ساخت همه ماتریس‌های امکان‌پذیری از پیکربندی خام (برای کش مسئله)"""
+    courses = list(config['courses'])
+    teachers = list(config['teachers'])
+    places = list(config['places'])
+    return {
+        'eligible_teachers': eligible_teacher_matrix(courses, teachers),
+        'suitable_places': suitable_place_matrix(courses, places),
+        'fits_capacity': capacity_matrix(courses, places),
+        'teacher_unavailable': teacher_unavailable_matrix(
+            teachers, config.get('constraints', []) or [], index.num_days, index.slot_ids
+        )
+    }
+
+
+class FeasibilityTables:
+    """
+    جداول جست‌وجوی O(1) روی ماتریس‌های امکان‌پذیری کامپایل‌شده
+
+    تعمیر و جهش به جای پیمایش همه اساتید/مکان‌ها در هر فراخوانی، فقط فهرست
+    از پیش ساخته‌شده همان درس یا استاد را می‌خوانند.
+    """
+
+    def __init__(self, index, eligible_teachers, suitable_places, fits_capacity, teacher_unavailable):
+        self.index = index
+        self.teachers_for = {
+            code: [index.teacher_codes[t] for t in np.flatnonzero(eligible_teachers[i])]
+            for i, code in enumerate(index.course_codes)
+        }
+        self.places_for = {
+            code: [index.place_codes[p] for p in np.flatnonzero(suitable_places[i])]
+            for i, code in enumerate(index.course_codes)
+        }
+        self.roomy_places_for = {
+            code: [index.place_codes[p] for p in np.flatnonzero(suitable_places[i] & fits_capacity[i])]
+            for i, code in enumerate(index.course_codes)
+        }
+        self.blocked_keys = {}
+        for t, code in enumerate(index.teacher_codes):
+            days, slots = np.nonzero(teacher_unavailable[t])
+            if len(days):
+                self.blocked_keys[code] = frozenset(
+                    (int(d) + 1, index.slot_ids[s]) for d, s in zip(days, slots)
+                )
+
+    @classmethod
+    def from_problem(cls, problem):
+        """ساخت جداول از مسئله کامپایل‌شده (problem_cache)"""
+        return cls(
+            problem.index,
+            problem.eligible_teachers,
+            problem.suitable_places,
+            problem.fits_capacity,
+            problem.teacher_unavailable
+        )
+
+    def is_unavailable(self, teacher_code, day, slot_id):
+        """آیا استاد در این روز و اسلات در دسترس نیست"""
+        return (day, slot_id) in self.blocked_keys.get(teacher_code, ())
@@ -0,0 +1,152 @@
+import os
+import multiprocessing as mp
+
+from bbo_new import BBOScheduler
+from seeding import spawn_seeds
+
+
+def migration_targets(island_id, num_islands, topology):
+    """جزیره‌های مقصد مهاجرت برای یک جزیره در توپولوژی داده‌شده"""
+    if num_islands < 2:
+        return []
+    if topology == 'ring':
+        return [(island_id + 1) % num_islands]
+    if topology == 'all':
+        return [j for j in range(num_islands) if j != island_id]
+    raise ValueError(f"توپولوژی مهاجرت نامعتبر: {topology}")
+
+
+# گزینه‌های مسیر فایل که هر جزیره نسخه جداگانه آن را می‌نویسد
+ISLAND_FILE_OPTIONS = ('telemetry_file', 'checkpoint_file', 'profile_file')
+
+
+class IslandScheduler(BBOScheduler):
+    """
+    زمان‌بند BBO یک جزیره: حلقه iterate با مهاجرت بین جزیره‌ها هر interval نسل
+
+    گزارش پیشرفت، معیارهای توقف و پروفایل مانند اجرای عادی از iterate می‌آیند.
+    جزیره‌ای که زودتر متوقف شود (مثلاً با time_limit یا stall_patience) با ارسال None به مقصدهایش
+    خبر می‌دهد تا آن‌ها منتظر مهاجران آن نمانند.
+    """
+
+    def __init__(self, config_file, island_id, num_islands, options, topology,
+                 interval, migrants, seed, inboxes):
+        options = dict(options)
+        for name in ISLAND_FILE_OPTIONS:
+            if options.get(name):
+                root, ext = os.path.splitext(options[name])
+                options[name] = f"{root}_island{island_id + 1}{ext}"
+        # جریان تصادفی مستقل جزیره از بذر فرزند island_id
+        super().__init__(config_file, options, seed=spawn_seeds(seed, num_islands)[island_id])
+        self.OPTIONS['workers'] = 0  # هر جزیره خود یک پردازه است
+        self.ITERATION_LABEL = f"جزیره {island_id + 1} - نسل"
+
+        self.island_id = island_id
+        self.interval = interval
+        self.migrants = migrants
+        self.inboxes = inboxes
+        self.targets = migration_targets(island_id, num_islands, topology)
+        self.expected = sum(
+            island_id in migration_targets(j, num_islands, topology) for j in range(num_islands)
+        )
+
+    def search_step(self, state):
+        """یک نسل BBO و در فواصل مشخص مهاجرت بین جزیره‌ها"""
+        super().search_step(state)
+        generation = state['iteration'] + 1
+        if generation % self.interval == 0 and generation < self.OPTIONS['maxgen']:
+            self.migrate(state)
+
+    def migrate(self, state):
+        """ارسال بهترین زیستگاه‌ها و جایگزینی بدترین‌ها با بهترین مهاجران دریافتی"""
+        population = state['population']
+        emigrants = [self.copy_schedule(s) for s in population[:self.migrants]]
+        for target in self.targets:
+            self.inboxes[target].put(emigrants)
+
+        immigrants = []
+        received = 0
+        while received < self.expected:
+            batch = self.inboxes[self.island_id].get()
+            if batch is None:
+                self.expected -= 1  # جزیره مبدأ متوقف شده است
+                continue
+            immigrants.extend(batch)
+            received += 1
+        immigrants = sorted(immigrants, key=lambda x: x['cost'])[:len(population) - 1]
+        for i, habitat in enumerate(immigrants):
+            population[-(i+1)] = habitat
+        state['population'] = sorted(population, key=lambda x: x['cost'])
+
+    def leave(self):
+        """اعلام پایان جزیره به مقصدهای مهاجرت"""
+        for target in self.targets:
+            self.inboxes[target].put(None)
+
+
+def _island_worker(config_file, island_id, num_islands, options, topology,
+                   interval, migrants, seed, inboxes, results):
+    """تکامل یک جزیره مستقل BBO و تبادل بهترین زیستگاه‌ها با جزیره‌های دیگر"""
+    scheduler = IslandScheduler(
+        config_file, island_id, num_islands, options, topology, interval, migrants, seed, inboxes
+    )
+    try:
+        best_schedule = scheduler.run_algorithm()
+    finally:
+        scheduler.leave()
+    results.put((island_id, scheduler.copy_schedule(best_schedule)))
+
+
+def run_islands(config_file, num_islands=4, topology='ring', interval=50, migrants=2,
+                seed=0, options=None):
+    """
+    اجرای BBO در مدل جزیره‌ای روی چند پردازه
+
+    پارامترها:
+        config_file (str): مسیر فایل پیکربندی YAML
+        num_islands (int): تعداد جزیره‌ها (پردازه‌ها)
+        topology (str): توپولوژی مهاجرت ('ring' یا 'all')
+        interval (int): تعداد نسل‌ها بین دو مهاجرت
+        migrants (int): تعداد بهترین زیستگاه‌های ارسالی در هر مهاجرت
+        seed (int): بذر پایه تصادفی (جزیره i از فرزند i آن استفاده می‌کند)
+        options (dict): تغییرات OPTIONS برای همه جزیره‌ها (گزارش پیشرفت به طور پیش‌فرض
+            هر interval نسل؛ مسیرهای telemetry_file، checkpoint_file و profile_file
+            برای هر جزیره با پسوند _island<k> نوشته می‌شوند)
+
+    خروجی:
+        بهترین زمان‌بندی سراسری و فهرست بهترین هزینه هر جزیره
+    """
+    migration_targets(0, num_islands, topology)  # اعتبارسنجی توپولوژی
+    options = dict(options or {})
+    options.setdefault('telemetry_every', interval)
+    inboxes = [mp.Queue() for _ in range(num_islands)]
+    results = mp.Queue()
+
+    processes = [
+        mp.Process(
+            target=_island_worker,
+            args=(config_file, i, num_islands, options, topology, interval, migrants, seed, inboxes, results)
+        )
+        for i in range(num_islands)
+    ]
+    for process in processes:
+        process.start()
+
+    island_bests = dict(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+
+    # ادغام نهایی: بهترین زیستگاه در میان همه جزیره‌ها
+    best_schedule = min(island_bests.values(), key=lambda x: x['cost'])
+    island_costs = [island_bests[i]['cost'] for i in range(num_islands)]
+    return best_schedule, island_costs
+
+
+if __name__ == "__main__":
+    print("شروع اجرای BBO جزیره‌ای برای زمان‌بندی کلاس‌ها...")
+    best_schedule, island_costs = run_islands("config.yaml", num_islands=mp.cpu_count())
+    print(f"بهترین هزینه هر جزیره: {island_costs}")
+    scheduler = BBOScheduler("config.yaml")
+    output_file = "final_schedule_islands.txt"
+    scheduler.save_schedule_to_file(best_schedule, output_file)
+    print(f"\nنتایج زمان‌بندی در فایل '{output_file}' ذخیره شد.")
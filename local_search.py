@@ -0,0 +1,206 @@
+import math
+
+from delta_cost import DeltaCostModel
+
+# انواع حرکت محلی: تغییر زمان (اسلات و روز)، جابه‌جایی زمان دو کلاس، تغییر مکان، تغییر استاد
+MOVE_TYPES = ('time', 'swap', 'place', 'teacher')
+
+
+class LocalSearch:
+    """
+    جستجوی محلی (تابو یا شبیه‌سازی تبرید) روی مدل هزینه افزایشی
+
+    هزینه هر حرکت با اعمال و بازگرداندن تخصیص‌ها در CostState مدل DeltaCostModel
+    در O(درجه) به دست می‌آید و راه‌حل کامل دوباره ارزیابی نمی‌شود. انتخاب‌های
+    تصادفی از scheduler.random استفاده می‌کنند تا اجرا با بذر زمان‌بند قابل
+    بازتولید بماند.
+
+    هر حرکت امتیازدهی‌شده (move_cost) یک ارزیابی در scheduler.evaluations شمرده
+    می‌شود تا بودجه max_evaluations و سرعت ارزیابی در telemetry واقعی بمانند.
+    """
+
+    def __init__(self, scheduler, method='tabu', moves=200, neighbors=20, tabu_tenure=10,
+                 temperature=100.0, cooling=0.98):
+        if method not in ('tabu', 'annealing'):
+            raise ValueError(f"روش جستجوی محلی نامعتبر: {method}")
+        if not hasattr(scheduler, 'delta_model'):
+            scheduler.delta_model = DeltaCostModel(scheduler)
+        self.scheduler = scheduler
+        self.model = scheduler.delta_model
+        self.method = method
+        self.moves = moves
+        self.neighbors = neighbors
+        self.tabu_tenure = tabu_tenure
+        self.temperature = temperature
+        self.cooling = cooling
+
+        # گزینه‌های هر درس برای حرکت‌های تغییر زمان، مکان و استاد
+        self.slot_ids = list(scheduler.time_slots)
+        self.num_days = len(scheduler.days)
+        self.place_choices = {
+            c['code']: [p['code'] for p in c['suitable_places']] for c in scheduler.course_list
+        }
+        self.teacher_choices = {
+            c['code']: [t['code'] for t in c['teachers']] for c in scheduler.course_list
+        }
+
+    @classmethod
+    def from_options(cls, scheduler):
+        """ساخت جستجوی محلی از کلیدهای OPTIONS زمان‌بند"""
+        options = scheduler.OPTIONS
+        return cls(
+            scheduler,
+            options['local_search'],
+            options.get('local_search_moves', 200),
+            options.get('local_search_neighbors', 20),
+            options.get('tabu_tenure', 10),
+            options.get('annealing_temperature', 100.0),
+            options.get('annealing_cooling', 0.98)
+        )
+
+    def improve(self, solution):
+        """
+        بهبود یک راه‌حل با حداکثر self.moves حرکت
+
+        خروجی:
+            راه‌حل جدید با بهترین تخصیص یافته‌شده (کپی با اشتراک ساختاری) یا خود
+            solution اگر بهبودی یافت نشود
+        """
+        key = self.scheduler.SOLUTION_KEY
+        position = solution[key]
+        if not position:
+            return solution
+        state = self.model.new_state(position)
+        self.scheduler.evaluations += 1
+
+        if self.method == 'tabu':
+            best_cost, best_assign = self.tabu_search(state)
+        else:
+            best_cost, best_assign = self.annealing(state)
+        if best_cost >= solution['cost']:
+            return solution
+
+        improved = self.scheduler.copy_solution(solution)
+        courses = improved[key]
+        for i, assignment in enumerate(best_assign):
+            if assignment != self.model.assignment_of(courses[i]):
+                course = courses.mutable(i)
+                course['teacher_code'], course['place_code'], course['slot_id'], course['day'] = assignment
+        improved['cost'] = best_cost
+        return improved
+
+    def tabu_search(self, state):
+        """
+        جستجوی تابو: در هر گام بهترین حرکت غیرتابو از میان self.neighbors حرکت
+        تصادفی اعمال می‌شود (حتی اگر هزینه را بدتر کند). بازگشت یک درس به تخصیص
+        قبلی‌اش تا tabu_tenure گام ممنوع است، مگر اینکه به بهترین هزینه جدید برسد.
+        """
+        current = self.model.total(state)
+        best_cost, best_assign = current, list(state.assign)
+        tabu = {}
+
+        for step in range(self.moves):
+            chosen = None
+            for _ in range(self.neighbors):
+                move = self.random_move(state)
+                if move is None:
+                    continue
+                cost = self.move_cost(state, move)
+                is_tabu = any(tabu.get(change, -1) > step for change in move)
+                if is_tabu and cost >= best_cost:
+                    continue
+                if chosen is None or cost < chosen[0]:
+                    chosen = (cost, move)
+            if chosen is None:
+                continue
+
+            cost, move = chosen
+            for i, _ in move:
+                tabu[(i, state.assign[i])] = step + self.tabu_tenure
+            self.apply_move(state, move)
+            current = cost
+            if current < best_cost:
+                best_cost, best_assign = current, list(state.assign)
+
+        return best_cost, best_assign
+
+    def annealing(self, state):
+        """
+        شبیه‌سازی تبرید: در هر گام یک حرکت تصادفی با احتمال exp(-Δ/T) پذیرفته
+        می‌شود (حرکت‌های بهبوددهنده همیشه) و دما در هر گام در cooling ضرب می‌شود.
+        """
+        rng = self.scheduler.random
+        current = self.model.total(state)
+        best_cost, best_assign = current, list(state.assign)
+        temperature = self.temperature
+
+        for _ in range(self.moves):
+            move = self.random_move(state)
+            if move is not None:
+                cost = self.move_cost(state, move)
+                delta = cost - current
+                if delta <= 0 or (temperature > 0 and rng.random() < math.exp(-delta / temperature)):
+                    self.apply_move(state, move)
+                    current = cost
+                    if current < best_cost:
+                        best_cost, best_assign = current, list(state.assign)
+            temperature *= self.cooling
+
+        return best_cost, best_assign
+
+    def random_move(self, state):
+        """
+        یک حرکت تصادفی به صورت فهرست (موقعیت درس، تخصیص جدید)
+
+        خروجی None یعنی حرکت انتخاب‌شده تغییری ایجاد نمی‌کند.
+        """
+        rng = self.scheduler.random
+        i = rng.randrange(len(state.assign))
+        teacher, place, slot, day = state.assign[i]
+        kind = rng.choice(MOVE_TYPES)
+
+        if kind == 'time':
+            move = [(i, (teacher, place, rng.choice(self.slot_ids), rng.randint(1, self.num_days)))]
+        elif kind == 'swap':
+            j = rng.randrange(len(state.assign))
+            other_teacher, other_place, other_slot, other_day = state.assign[j]
+            move = [(i, (teacher, place, other_slot, other_day)),
+                    (j, (other_teacher, other_place, slot, day))]
+        elif kind == 'place':
+            places = self.place_choices.get(state.codes[i])
+            if not places:
+                return None
+            move = [(i, (teacher, rng.choice(places), slot, day))]
+        else:
+            teachers = self.teacher_choices.get(state.codes[i])
+            if not teachers:
+                return None
+            move = [(i, (rng.choice(teachers), place, slot, day))]
+
+        if all(state.assign[k] == assignment for k, assignment in move):
+            return None
+        return move
+
+    def apply_move(self, state, move):
+        """اعمال حرکت روی شمارنده‌ها"""
+        for i, assignment in move:
+            self.model.apply(state, i, assignment)
+
+    def move_cost(self, state, move):
+        """هزینه کل پس از حرکت (وضعیت پس از محاسبه به حالت قبل بازمی‌گردد)"""
+        self.scheduler.evaluations += 1
+        old = [(i, state.assign[i]) for i, _ in move]
+        self.apply_move(state, move)
+        cost = self.model.total(state)
+        self.apply_move(state, reversed(old))
+        return cost
+
+
+if __name__ == "__main__":
+    from bbo_new import BBOScheduler
+
+    scheduler = BBOScheduler("config.yaml", {'local_search': 'tabu', 'local_search_moves': 2000})
+    print("ساخت جمعیت اولیه و بهبود بهترین زمان‌بندی با جستجوی محلی...")
+    best = scheduler.initial_population()[0]
+    improved = LocalSearch.from_options(scheduler).improve(best)
+    print(f"هزینه اولیه = {best['cost']}، هزینه پس از جستجوی محلی = {improved['cost']}")
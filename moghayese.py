@@ -1,45 +1,27 @@
-import time
-import matplotlib.pyplot as plt
-
-from bbo_new import BBOScheduler
-from gwo_pro import GWOScheduler
+from batch_runner import run_batch, summarize, print_summary, plot_results
 
 config_path = "config.yaml"
 
-bbo_costs = []
-gwo_costs = []
-
 N_RUNS = 10
 
-print("⚙️ در حال اجرای مقایسه بین BBO و GWO...\n")
-
-for i in range(N_RUNS):
-    print(f"🔁 اجرا {i + 1}")
-
-    # ---------- BBO ----------
-    bbo = BBOScheduler(config_path)
-    bbo_pop = bbo.initialize_population()
-    bbo_pop = bbo.cost_function(bbo_pop)
-    bbo_best = min(bbo_pop, key=lambda x: x['cost'])
-    bbo_costs.append(bbo_best['cost'])
-
-    # ---------- GWO ----------
-    gwo = GWOScheduler(config_path)
-    gwo_result = gwo.run_algorithm()
-    gwo_costs.append(gwo_result['cost'])
-
-# نمایش نتایج عددی
-print("\n📊 نتایج نهایی:")
-print(f"BBO - میانگین هزینه: {sum(bbo_costs) / N_RUNS:.2f} | بهترین: {min(bbo_costs)} | بدترین: {max(bbo_costs)}")
-print(f"GWO - میانگین هزینه: {sum(gwo_costs) / N_RUNS:.2f} | بهترین: {min(gwo_costs)} | بدترین: {max(gwo_costs)}")
-
-# نمودار مقایسه‌ای
-plt.plot(bbo_costs, label="BBO", marker='o')
-plt.plot(gwo_costs, label="GWO", marker='x')
-plt.title("مقایسه هزینه در ۱۰ اجرا")
-plt.xlabel("شماره اجرا")
-plt.ylabel("Cost")
-plt.legend()
-plt.grid(True)
-plt.tight_layout()
-plt.show()
+# اجرا فقط در پردازه اصلی؛ در روش spawn کارگرهای استخر این ماژول را دوباره وارد می‌کنند
+if __name__ == "__main__":
+    print("⚙️ در حال اجرای مقایسه بین BBO و GWO...\n")
+
+    # اجراهای بذردار هر دو موتور به صورت هم‌زمان روی همه هسته‌ها
+    results = run_batch(config_path, engines=('bbo', 'gwo'), runs=N_RUNS)
+
+    # نمایش نتایج عددی
+    summary = summarize(results)
+    print("\n📊 نتایج نهایی:")
+    for row in summary:
+        print(f"{row['engine'].upper()} - میانگین هزینه: {row['mean_cost']:.2f} | بهترین: {row['best_cost']} | بدترین: {row['worst_cost']}")
+    print()
+    print_summary(summary)
+
+    # نمودار مقایسه‌ای (ذخیره در فایل، بدون نیاز به نمایشگر)
+    try:
+        output_file = plot_results(results, "moghayese.png")
+        print(f"\nنمودار مقایسه در فایل '{output_file}' ذخیره شد.")
+    except ImportError:
+        print("\nmatplotlib نصب نیست؛ نمودار رسم نشد.")
@@ -0,0 +1,50 @@
+from collections import defaultdict, Counter
+
+
+class ScheduleOccupancy:
+    """
+    نمایه اشغال یک زمان‌بندی: استاد/مکان -> مجموعه (روز، اسلات)های اشغال‌شده
+
+    شمارنده‌ها اجازه می‌دهند چند کلاس هم‌زمان (تداخل) هم درست ثبت و حذف شوند و
+    مجموعه‌ها یافتن اسلات‌های آزاد را به یک تفاضل مجموعه تبدیل می‌کنند.
+    blocked (استاد -> مجموعه (روز، اسلات)های عدم حضور) هرگز آزاد شمرده نمی‌شود.
+    """
+
+    def __init__(self, courses, all_keys, blocked=None):
+        self.all_keys = frozenset(all_keys)
+        self.blocked = blocked or {}
+        self.teacher_counts = defaultdict(Counter)
+        self.place_counts = defaultdict(Counter)
+        self.teacher_busy = defaultdict(set)
+        self.place_busy = defaultdict(set)
+        for course in courses:
+            self.add(course)
+
+    def add(self, course):
+        """ثبت یک کلاس در نمایه"""
+        key = (course['day'], course['slot_id'])
+        self._increment(self.teacher_counts[course['teacher_code']], self.teacher_busy[course['teacher_code']], key)
+        self._increment(self.place_counts[course['place_code']], self.place_busy[course['place_code']], key)
+
+    def remove(self, course):
+        """حذف یک کلاس از نمایه"""
+        key = (course['day'], course['slot_id'])
+        self._decrement(self.teacher_counts[course['teacher_code']], self.teacher_busy[course['teacher_code']], key)
+        self._decrement(self.place_counts[course['place_code']], self.place_busy[course['place_code']], key)
+
+    def free_keys(self, teacher_code, place_code):
+        """(روز، اسلات)هایی که هم استاد و هم مکان در آن‌ها آزادند"""
+        free = self.all_keys - self.teacher_busy[teacher_code] - self.place_busy[place_code]
+        return free - self.blocked.get(teacher_code, frozenset())
+
+    @staticmethod
+    def _increment(counts, busy, key):
+        counts[key] += 1
+        busy.add(key)
+
+    @staticmethod
+    def _decrement(counts, busy, key):
+        counts[key] -= 1
+        if counts[key] <= 0:
+            del counts[key]
+            busy.discard(key)
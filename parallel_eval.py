@@ -0,0 +1,107 @@
+import multiprocessing as mp
+
+import numpy as np
+
+from cow import CowList
+
+# زمان‌بند هر پردازه کارگر (یک بار در شروع پردازه ساخته می‌شود)
+_worker_scheduler = None
+
+# گزینه‌هایی که در کارگر همیشه خاموش‌اند (گزارش، فایل‌ها و استخر تو در تو)
+WORKER_OPTIONS = {
+    'workers': 0,
+    'verbose': 0,
+    'telemetry': 'null',
+    'profile': False,
+    'checkpoint_file': None,
+    'local_search': None
+}
+
+
+def _init_worker(scheduler_cls, config_file, options):
+    """
+    مقداردهی اولیه کارگر: ساخت زمان‌بند هم‌نوع با همان OPTIONS
+
+    مسئله از کش کامپایل‌شده بارگذاری می‌شود و فقط یک بار در هر پردازه ساخته
+    می‌شود. جریان تصادفی کارگر برای هر زیستگاه از بذر ارسالی والد تنظیم می‌شود.
+    """
+    global _worker_scheduler
+    _worker_scheduler = scheduler_cls(config_file, dict(options, **WORKER_OPTIONS))
+
+
+def _repair_and_evaluate_chunk(task):
+    """اصلاح، کدگذاری و ارزیابی یک بخش از جمعیت در کارگر"""
+    schedules, seeds = task
+    scheduler = _worker_scheduler
+    key = scheduler.SOLUTION_KEY
+    solutions = []
+    for courses, seed in zip(schedules, seeds):
+        # اصلاح هر زیستگاه فقط به بذر خودش و استفاده مکان‌های خودش وابسته است
+        scheduler.random.seed(seed)
+        scheduler.place_usage.clear()
+        for course in courses:
+            scheduler.place_usage[course['place_code']] += 1
+        # کلاس‌های مهاجرت‌کرده بین زیستگاه‌های یک بخش مشترک‌اند؛ copy() آن‌ها را
+        # اشتراکی علامت می‌زند تا اصلاح پیش از نوشتن کپی کند
+        solution = {key: CowList(courses).copy(), 'cost': float('inf')}
+        scheduler.repair_solution(solution)
+        solutions.append(solution)
+    scheduler.cost_function(solutions)
+    return [(list(s[key]), s['cost']) for s in solutions]
+
+
+class ParallelEvaluator:
+    """
+    اصلاح و ارزیابی موازی جمعیت با مجموعه‌ای از پردازه‌ها
+
+    هر کارگر یک زمان‌بند کامل هم‌نوع والد دارد و بخش‌هایی از زیستگاه‌ها را
+    اصلاح، کدگذاری و ارزیابی می‌کند؛ والد فقط فهرست کلاس‌ها را می‌فرستد و
+    فهرست اصلاح‌شده و هزینه را پس می‌گیرد. اصلاح هر زیستگاه با بذر جداگانه‌ای
+    از مولد والد انجام می‌شود، پس نتیجه به تعداد کارگرها وابسته نیست (اما با
+    اجرای سریال که از جریان پیوسته self.random استفاده می‌کند یکسان نیست).
+
+    هزینه ثابت هر نسل ارسال و دریافت زیستگاه‌هاست؛ روی نمونه‌های کوچک (مانند
+    config.yaml با حدود 40 درس) اجرای سریال سریع‌تر است و استخر برای نمونه‌های
+    بزرگ با هسته‌های آزاد سودمند است.
+    """
+
+    def __init__(self, scheduler, workers):
+        self.workers = workers
+        self.key = scheduler.SOLUTION_KEY
+        self.pool = mp.Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(type(scheduler), scheduler.config_file, dict(scheduler.OPTIONS))
+        )
+
+    def repair_and_evaluate(self, population, seeds):
+        """
+        اصلاح و ارزیابی کل جمعیت
+
+        پارامترها:
+            population (list): زیستگاه‌ها (در جای خود با نتیجه جایگزین می‌شوند)
+            seeds (list): بذر صحیح اصلاح هر زیستگاه
+        """
+        chunks = [c for c in np.array_split(np.arange(len(population)), self.workers * 2) if len(c)]
+        tasks = [
+            ([list(population[i][self.key]) for i in chunk.tolist()], [seeds[i] for i in chunk.tolist()])
+            for chunk in chunks
+        ]
+        results = self.pool.map(_repair_and_evaluate_chunk, tasks)
+        for chunk, result in zip(chunks, results):
+            for i, (courses, cost) in zip(chunk.tolist(), result):
+                # کلاس‌های دست‌نخورده در یک بخش هنوز بین زیستگاه‌ها مشترک‌اند
+                population[i][self.key] = CowList(courses).copy()
+                population[i]['cost'] = cost
+        return population
+
+    def close(self):
+        """بستن استخر پردازه‌ها"""
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
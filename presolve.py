@@ -0,0 +1,273 @@
+from collections import defaultdict
+
+from cow import CowList
+from occupancy import ScheduleOccupancy
+from time_tables import maintenance_blocks
+
+
+def augmenting_path(root, neighbors, owner):
+    """
+    مسیر افزایشی تطابق دوبخشی از root (الگوریتم Kuhn)
+
+    جستجوی عمقی با پشته صریح انجام می‌شود تا طول مسیر به حد بازگشت پایتون
+    محدود نباشد. هر یال در یک جستجو حداکثر یک بار دنبال می‌شود.
+
+    پارامترها:
+        root: گره آغاز (درس)
+        neighbors: تابع گره -> فهرست یال‌های مجاز به ترتیب ترجیح
+        owner (dict): یال -> گره تطابق‌یافته با آن
+
+    خروجی:
+        فهرست (گره، یال جدید) از root تا انتهای مسیر یا None اگر مسیری نباشد
+    """
+    visited = set()
+    stack = []                            # [گره، پیمایشگر یال‌ها، یال در حال امتحان]
+    node = root
+    while True:
+        edges = neighbors(node)
+        free = next((edge for edge in edges if edge not in owner), None)
+        if free is not None:
+            return [(frame[0], frame[2]) for frame in stack] + [(node, free)]
+        stack.append([node, iter(edges), None])
+
+        # یال دیده‌نشده بعدی در عمیق‌ترین گره؛ گره‌های بدون یال باقی‌مانده کنار می‌روند
+        node = None
+        while stack and node is None:
+            frame = stack[-1]
+            edge = next((e for e in frame[1] if e not in visited), None)
+            if edge is None:
+                stack.pop()
+                continue
+            visited.add(edge)
+            frame[2] = edge
+            node = owner[edge]
+        if node is None:
+            return None
+
+
+class Presolver:
+    """
+    پیش‌حل محدودیت‌های سخت پیش از جستجوی فراابتکاری
+
+    ابتدا دامنه هر درس هرس می‌شود: اساتید مجاز (با جنسیت سازگار)، مکان‌های
+    مناسب (نوع، جنسیت، در دسترس بودن) و (روز، اسلات)های خارج از زمان عدم حضور
+    استاد. سپس یک زمان‌بندی بدون تداخل در دو مرحله تطابق دوبخشی ساخته می‌شود:
+
+    1. درس -> (استاد، روز، اسلات): هر جفت استاد-زمان حداکثر یک درس (بدون تداخل استاد)
+    2. برای هر (روز، اسلات)، دروس آن زمان -> مکان‌های مجاز آن روز (بدون تداخل مکان
+       و تعمیرات)
+
+    دروسی که در مرحله 2 مکانی نیابند، آن جفت استاد-زمان را ممنوع می‌کنند و مرحله 1
+    با مسیر افزایشی برای آن‌ها تکرار می‌شود. محدودیت‌های نرم (بار کاری، پیش‌نیاز،
+    توازن مکان‌ها و ...) فقط به صورت ترتیب ترجیح لحاظ می‌شوند.
+    """
+
+    def __init__(self, scheduler, max_rounds=20):
+        self.scheduler = scheduler
+        self.max_rounds = max_rounds
+        self.key = scheduler.SOLUTION_KEY
+        self.blocked_places = maintenance_blocks(scheduler.constraints, len(scheduler.days))
+
+        # ترتیب دروس مانند initialize_population: دروس با مکان‌های مناسب کمتر اول
+        self.order = []
+        self.teachers = {}
+        self.places = {}
+        self.time_domains = {}
+        self.skipped = []
+        self.stats = {'teacher_options': 0, 'place_options': 0, 'time_options': 0, 'pruned_time_options': 0}
+        for course in sorted(scheduler.course_list, key=lambda c: len(c['suitable_places'])):
+            teachers = scheduler.compatible_teachers(course)
+            places = [p['code'] for p in course['suitable_places']]
+            if not teachers or not places:
+                self.skipped.append(course['code'])
+                continue
+            code = course['code']
+            self.order.append(code)
+            self.teachers[code] = teachers
+            self.places[code] = places
+            for teacher in teachers:
+                if teacher not in self.time_domains:
+                    blocked = scheduler.feasibility.blocked_keys.get(teacher, frozenset())
+                    self.time_domains[teacher] = [k for k in scheduler.slot_keys if k not in blocked]
+                self.stats['time_options'] += len(self.time_domains[teacher])
+                self.stats['pruned_time_options'] += len(scheduler.slot_keys) - len(self.time_domains[teacher])
+            self.stats['teacher_options'] += len(teachers)
+            self.stats['place_options'] += len(places)
+
+    def place_allowed(self, place, day):
+        """آیا مکان در این روز در حال تعمیر نیست"""
+        return self.blocked_places.get((place, day), 0) == 0
+
+    def solve(self):
+        """
+        ساخت یک زمان‌بندی بدون تداخل سخت (تا حد امکان)
+
+        خروجی:
+            راه‌حل {SOLUTION_KEY: CowList کلاس‌ها، 'cost': inf}؛ تعداد دروسی که
+            بدون نقض سخت جایابی نشدند در self.stats['unresolved'] است
+        """
+        self.owner = {}                   # (استاد، (روز، اسلات)) -> درس
+        self.match = {}                   # درس -> (استاد، (روز، اسلات))
+        self.teacher_units = defaultdict(int)
+        self.edge_lists = {}              # درس -> جفت‌های (استاد، زمان) مجاز در این اجرا
+
+        for code in self.order:
+            self.augment(code)
+
+        placed = {}
+        for _ in range(self.max_rounds):
+            placed, unplaced = self.assign_places()
+            if not unplaced:
+                break
+            progress = False
+            for code in unplaced:
+                self.edge_lists[code].remove(self.match[code])
+                self.release(code)
+                progress |= self.augment(code)
+            if not progress:
+                break
+
+        return self.build_solution(placed)
+
+    def edges(self, code):
+        """
+        جفت‌های (استاد، زمان) مجاز درس: اساتید کم‌بارتر اول و زمان‌ها به ترتیب تصادفی
+
+        فهرست در اولین مراجعه هر اجرای solve ساخته و نگه‌داری می‌شود؛ جفت‌های
+        ممنوع‌شده (بدون مکان) از همین فهرست حذف می‌شوند.
+        """
+        edges = self.edge_lists.get(code)
+        if edges is None:
+            rng = self.scheduler.random
+            units = self.teacher_units
+            edges = []
+            for teacher in sorted(self.teachers[code], key=lambda t: units[t]):
+                keys = list(self.time_domains[teacher])
+                rng.shuffle(keys)
+                edges.extend((teacher, k) for k in keys)
+            self.edge_lists[code] = edges
+        return edges
+
+    def augment(self, code):
+        """یافتن جفت استاد-زمان آزاد برای درس یا مسیر افزایشی (الگوریتم Kuhn)"""
+        path = augmenting_path(code, self.edges, self.owner)
+        if path is None:
+            return False
+        # از انتهای مسیر به سمت درس آغاز تا هر جفت پیش از گرفته شدن آزاد شده باشد
+        for node, edge in reversed(path):
+            self.take(node, edge)
+        return True
+
+    def take(self, code, edge):
+        """تخصیص جفت استاد-زمان به درس (آزاد کردن جفت قبلی آن)"""
+        self.release(code)
+        self.match[code] = edge
+        self.owner[edge] = code
+        self.teacher_units[edge[0]] += self.scheduler.courses[code].get('units', 0)
+
+    def release(self, code):
+        """آزاد کردن جفت استاد-زمان فعلی درس"""
+        edge = self.match.pop(code, None)
+        if edge is not None and self.owner.get(edge) == code:
+            del self.owner[edge]
+            self.teacher_units[edge[0]] -= self.scheduler.courses[code].get('units', 0)
+
+    def assign_places(self):
+        """
+        تطابق دروس هر زمان با مکان‌های مجاز آن روز (مکان‌های کم‌استفاده‌تر اول)
+
+        خروجی:
+            (درس -> مکان، فهرست دروس بدون مکان)
+        """
+        by_key = defaultdict(list)
+        for code in self.order:
+            if code in self.match:
+                by_key[self.match[code][1]].append(code)
+
+        usage = defaultdict(int)
+        placed = {}
+        unplaced = []
+        for key in sorted(by_key):
+            day = key[0]
+            place_owner = {}
+            options = {}
+
+            def neighbors(code):
+                # مکان‌های مجاز درس در این روز (usage در طول یک زمان ثابت است)
+                if code not in options:
+                    options[code] = sorted(
+                        (p for p in self.places[code] if self.place_allowed(p, day)),
+                        key=lambda p: usage[p]
+                    )
+                return options[code]
+
+            for code in by_key[key]:
+                path = augmenting_path(code, neighbors, place_owner)
+                if path is None:
+                    unplaced.append(code)
+                    continue
+                for node, place in path:
+                    place_owner[place] = node
+            for place, code in place_owner.items():
+                placed[code] = place
+                usage[place] += 1
+        return placed, unplaced
+
+    def build_solution(self, placed):
+        """ساخت راه‌حل با قالب دیکشنری کلاس‌ها؛ دروس حل‌نشده تخصیص تصادفی از دامنه هرس‌شده می‌گیرند"""
+        rng = self.scheduler.random
+        courses = CowList()
+        unresolved = 0
+        for code in self.order:
+            if code in self.match:
+                teacher, (day, slot_id) = self.match[code]
+            else:
+                # بدون جفت استاد-زمان آزاد: زمان تصادفی از دامنه هرس‌شده (تابع هزینه تداخل را جریمه می‌کند)
+                teacher = self.teachers[code][0]
+                day, slot_id = rng.choice(self.time_domains[teacher] or self.scheduler.slot_keys)
+            place = placed.get(code) or rng.choice(self.places[code])
+            unresolved += code not in placed
+            courses.append({
+                'course_code': code,
+                'teacher_code': teacher,
+                'place_code': place,
+                'slot_id': slot_id,
+                'day': day
+            })
+        self.stats['unresolved'] = unresolved
+        return {self.key: courses, 'cost': float('inf')}
+
+    def perturb(self, solution, rate):
+        """
+        جابه‌جایی تصادفی زمان کسری از کلاس‌ها به زمان‌های آزاد استاد و مکان
+
+        فقط زمان‌هایی انتخاب می‌شوند که تداخل، عدم حضور استاد یا تعمیرات مکان ایجاد
+        نکنند؛ بنابراین راه‌حل بدون تداخل، بدون تداخل باقی می‌ماند.
+        """
+        rng = self.scheduler.random
+        courses = solution[self.key]
+        occupancy = ScheduleOccupancy(courses, self.scheduler.slot_keys, self.scheduler.feasibility.blocked_keys)
+        for j in range(len(courses)):
+            if rng.random() >= rate:
+                continue
+            course = courses[j]
+            occupancy.remove(course)
+            free = [
+                key for key in occupancy.free_keys(course['teacher_code'], course['place_code'])
+                if self.place_allowed(course['place_code'], key[0])
+            ]
+            if free:
+                course = courses.mutable(j)
+                course['day'], course['slot_id'] = rng.choice(sorted(free))
+            occupancy.add(course)
+        return solution
+
+    def summary(self):
+        """خلاصه متنی هرس دامنه‌ها و نتیجه پیش‌حل"""
+        stats = self.stats
+        return (
+            f"پیش‌حل: {len(self.order)} درس، {len(self.skipped)} درس بدون استاد/مکان، "
+            f"{stats['pruned_time_options']} گزینه زمانی هرس‌شده از "
+            f"{stats['time_options'] + stats['pruned_time_options']}، "
+            f"{stats.get('unresolved', 0)} درس بدون جایابی بدون تداخل"
+        )
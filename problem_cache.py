@@ -0,0 +1,138 @@
+import os
+import pickle
+import hashlib
+import shutil
+import tempfile
+
+import yaml
+import numpy as np
+
+from encoding import ProblemIndex
+from feasibility import compile_feasibility
+
+# با هر تغییر در ساختار فایل‌های کش این عدد افزایش می‌یابد
+CACHE_VERSION = 2
+
+# کش درون‌پردازه‌ای: هش -> (بایت‌های pickle، آرایه‌ها)
+_memory_cache = {}
+
+
+class CompiledProblem:
+    """
+    نسخه کامپایل‌شده مسئله: پیکربندی، جداول نگاشت و ماتریس‌های امکان‌پذیری
+
+    config در هر بارگذاری یک کپی مستقل است (زمان‌بندها دیکشنری دروس را تغییر
+    می‌دهند)، اما آرایه‌ها فقط‌خواندنی و در صورت امکان memory-map شده‌اند.
+    """
+
+    def __init__(self, key, config, index, arrays):
+        self.key = key
+        self.config = config
+        self.index = index
+        self.arrays = arrays
+
+    def __getattr__(self, name):
+        arrays = self.__dict__.get('arrays', {})
+        if name in arrays:
+            return arrays[name]
+        raise AttributeError(name)
+
+
+def config_hash(config_file):
+    """هش محتوای فایل YAML به همراه نسخه ساختار کش"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    with open(config_file, 'rb') as file:
+        digest.update(file.read())
+    return digest.hexdigest()
+
+
+def compile_problem(config):
+    """ساخت جداول نگاشت و ماتریس‌های ایستا از پیکربندی خام"""
+    index = ProblemIndex.from_config(config)
+    courses = list(config['courses'])
+
+    # ماتریس‌های امکان‌پذیری درس×استاد، درس×مکان و استاد×روز×اسلات
+    arrays = compile_feasibility(config, index)
+
+    # یال‌های پیش‌نیاز/هم‌نیاز به صورت (اندیس درس، اندیس پیش‌نیاز) و -1 برای کد ناشناخته
+    def edges(field):
+        pairs = [
+            (i, index.course_index.get(req, -1))
+            for i, course in enumerate(courses)
+            for req in course.get(field, []) or []
+        ]
+        return np.array(pairs, dtype=np.int32).reshape(-1, 2)
+
+    arrays['prereq_edges'] = edges('prerequisites')
+    arrays['coreq_edges'] = edges('corequisites')
+    return index, arrays
+
+
+def default_cache_dir(config_file):
+    """پوشه پیش‌فرض کش در کنار فایل پیکربندی"""
+    return os.path.join(os.path.dirname(os.path.abspath(config_file)), '.schedule_cache')
+
+
+def load_compiled_problem(config_file, cache_dir=None):
+    """
+    بارگذاری مسئله با استفاده خودکار از کش کامپایل‌شده
+
+    اگر محتوای YAML تغییر نکرده باشد، به جای yaml.safe_load و ساخت دوباره
+    ماتریس‌ها، نسخه ذخیره‌شده روی دیسک (یا در حافظه همین پردازه) استفاده می‌شود.
+
+    پارامترها:
+        config_file (str): مسیر فایل پیکربندی YAML
+        cache_dir (str): پوشه کش (پیش‌فرض: .schedule_cache کنار فایل پیکربندی)
+    """
+    key = config_hash(config_file)
+    if key in _memory_cache:
+        payload, arrays = _memory_cache[key]
+        data = pickle.loads(payload)
+        return CompiledProblem(key, data['config'], data['index'], arrays)
+
+    cache_dir = cache_dir or default_cache_dir(config_file)
+    path = os.path.join(cache_dir, key)
+    payload, arrays = _read_cache(path)
+    if payload is None:
+        with open(config_file, 'r', encoding='utf-8') as file:
+            config = yaml.safe_load(file)
+        index, arrays = compile_problem(config)
+        payload = pickle.dumps({'config': config, 'index': index}, protocol=pickle.HIGHEST_PROTOCOL)
+        _write_cache(path, payload, arrays)
+
+    _memory_cache[key] = (payload, arrays)
+    data = pickle.loads(payload)
+    return CompiledProblem(key, data['config'], data['index'], arrays)
+
+
+def _read_cache(path):
+    """خواندن کش از دیسک (آرایه‌ها به صورت memory-map)"""
+    problem_file = os.path.join(path, 'problem.pickle')
+    if not os.path.isfile(problem_file):
+        return None, None
+    try:
+        with open(problem_file, 'rb') as file:
+            payload = file.read()
+        arrays = {}
+        for name in os.listdir(path):
+            if name.endswith('.npy'):
+                arrays[name[:-4]] = np.load(os.path.join(path, name), mmap_mode='r')
+        return payload, arrays
+    except (OSError, ValueError):
+        return None, None
+
+
+def _write_cache(path, payload, arrays):
+    """نوشتن اتمیک کش روی دیسک؛ خطای نوشتن فقط باعث عدم استفاده از کش می‌شود"""
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=os.path.dirname(path))
+        with open(os.path.join(tmp_path, 'problem.pickle'), 'wb') as file:
+            file.write(payload)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, name + '.npy'), array)
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path is not None:
+            shutil.rmtree(tmp_path, ignore_errors=True)
@@ -0,0 +1,83 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from collections import defaultdict
+
+from telemetry import PhaseTimer
+
+# زمینه خالی برای زمانی که پروفایل غیرفعال است
+_NO_PHASE = nullcontext()
+
+
+def term_phase(profiler, name):
+    """زمینه زمان‌سنجی یک جمله هزینه (بدون هزینه اضافه وقتی profiler برابر None است)"""
+    if profiler is None:
+        return _NO_PHASE
+    return profiler.phase(name, 'cost_terms')
+
+
+class PhaseProfiler(PhaseTimer):
+    """
+    زمان‌سنج سبک مراحل جستجو برای اجراهای واقعی (بدون نیاز به profiler خارجی)
+
+    علاوه بر زمان مراحل برای telemetry، تعداد فراخوانی و زمان کل هر مرحله را در
+    گروه‌های جداگانه نگه می‌دارد: 'operators' (مهاجرت، جهش، اصلاح، ارزیابی و
+    مرتب‌سازی) و 'cost_terms' (هر جمله تابع هزینه). گروه‌ها تو در تو هستند: زمان
+    جملات هزینه بخشی از زمان عملگر evaluation است.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stats = defaultdict(dict)
+        self.start_time = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name, group='operators'):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if group == 'operators':
+                self.totals[name] += elapsed
+            entry = self.stats[group].setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def report(self):
+        """گزارش قابل پردازش: برای هر گروه و مرحله تعداد، زمان کل، میانگین و سهم از کل اجرا"""
+        wall_time = time.perf_counter() - self.start_time
+        report = {'wall_time': wall_time}
+        for group, entries in self.stats.items():
+            report[group] = {
+                name: {
+                    'calls': calls,
+                    'total': total,
+                    'mean': total / calls if calls else 0.0,
+                    'share': total / wall_time if wall_time > 0 else 0.0
+                }
+                for name, (calls, total) in sorted(entries.items(), key=lambda x: -x[1][1])
+            }
+        return report
+
+    def summary(self):
+        """جدول متنی خلاصه برای چاپ در پایان اجرا"""
+        report = self.report()
+        lines = [f"پروفایل اجرا (زمان کل = {report['wall_time']:.2f} ثانیه)"]
+        for group, entries in report.items():
+            if group == 'wall_time':
+                continue
+            lines.append("-" * 70)
+            lines.append(f"{group:<25}{'فراخوانی':>10}{'کل (ثانیه)':>12}{'میانگین (ms)':>13}{'سهم':>8}")
+            for name, entry in entries.items():
+                lines.append(
+                    f"{name:<25}{entry['calls']:>10}{entry['total']:>12.3f}"
+                    f"{entry['mean'] * 1000:>13.3f}{entry['share']:>8.1%}"
+                )
+        return "\n".join(lines)
+
+    def save(self, path):
+        """ذخیره گزارش به صورت JSON"""
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.report(), file, ensure_ascii=False, indent=2)
+        return path
@@ -0,0 +1,1036 @@
+from collections import defaultdict
+from encoding import EncodedPopulation
+from problem_cache import load_compiled_problem
+from batch_cost import BatchCostEvaluator
+from occupancy import ScheduleOccupancy
+from feasibility import FeasibilityTables
+from cow import CowList
+from constraints import compile_constraint_kernels
+from stopping import StoppingCriteria, STOP_REASONS
+from checkpoint import encode_solutions, decode_solutions, save_checkpoint, load_checkpoint
+from telemetry import make_sink, PhaseTimer
+from profiling import PhaseProfiler, term_phase
+from seeding import seed_sequence, make_generators
+from local_search import LocalSearch
+from presolve import Presolver
+from coloring import ColoringInitializer
+from export import export_schedule
+
+class BaseScheduler:
+    """
+    هسته مشترک زمان‌بندها: مدل مسئله، نمایش فشرده، ارزیاب هزینه، عملگر اصلاح و گزارش
+
+    موتورهای جستجو (GWOScheduler، BBOScheduler) از این کلاس ارث می‌برند و فقط
+    پارامترها (setup_algorithm_parameters) و یک گام جستجوی خود (init_search_state،
+    search_step) را تعریف می‌کنند. هر راه‌حل دیکشنری {SOLUTION_KEY: CowList کلاس‌ها،
+    'cost': هزینه} است.
+    
+    وضعیت جستجو دیکشنری {'iteration', 'population', 'leaders', 'best'} است؛ leaders
+    فهرست راه‌حل‌های راهنمای موتور (آلفا، بتا و دلتا در GWO) است.
+    """
+    
+    # کلید فهرست کلاس‌ها در دیکشنری راه‌حل ('position' در GWO، 'courses' در BBO)
+    SOLUTION_KEY = 'courses'
+    # کلید اندازه جمعیت در OPTIONS
+    POPULATION_OPTION = 'popsize'
+    # کلید تعداد تکرار/نسل در OPTIONS و عنوان آن در گزارش پیشرفت
+    ITERATIONS_OPTION = 'maxgen'
+    ITERATION_LABEL = 'نسل'
+    
+    def __init__(self, config_file, options=None, seed=None):
+        """
+        مقداردهی اولیه زمان‌بندی
+        
+        پارامترها:
+            config_file (str): مسیر فایل پیکربندی YAML
+            options (dict): مقادیر اختیاری برای جایگزینی OPTIONS پیش‌فرض (مثلاً verbose)
+            seed (int | SeedSequence): بذر مولدهای تصادفی (None = بذر تازه، ذخیره در self.seed)
+        """
+        # مولدهای تصادفی مختص این زمان‌بند (بدون وابستگی به random و np.random سراسری)
+        self.reseed(seed)
+        
+        # بارگذاری فایل پیکربندی (از کش کامپایل‌شده اگر YAML تغییر نکرده باشد)
+        self.config_file = config_file
+        self.problem = load_compiled_problem(config_file)
+        self.config = self.problem.config
+        
+        # تنظیم پارامترهای الگوریتم
+        self.setup_algorithm_parameters()
+        self.OPTIONS.update(options or {})
+        
+        # زمان صرف‌شده در مراحل جستجو (برای telemetry) و پروفایل اختیاری اجرا
+        self.phase_timer = PhaseTimer()
+        self.profiler = None
+        
+        # بارگذاری و آماده‌سازی داده‌ها
+        self.load_and_prepare_data()
+        
+        # دیکشنری برای ردیابی استفاده از مکان‌ها
+        self.place_usage = defaultdict(int)
+        self.max_place_usage = 5  # حداکثر تعداد کلاس در هر مکان
+        
+        # شمارنده ارزیابی‌های تابع هزینه (برای محک‌زنی)
+        self.evaluations = 0
+        
+        # استخر اصلاح و ارزیابی موازی (موتورهایی که از آن پشتیبانی می‌کنند در iterate می‌سازند)
+        self.parallel_evaluator = None
+        
+        # جستجوی محلی ممتیک روی بهترین راه‌حل‌های هر تکرار (OPTIONS['local_search'])
+        self.local_search = None
+        
+        # معیارهای توقف اجرای جاری و دلیل توقف آخرین اجرا
+        self.stopping = None
+        self.stop_reason = None
+        self.best_solution = None
+    
+    def reseed(self, seed=None):
+        """
+        ساخت دوباره مولدهای تصادفی از یک بذر
+        
+        self.random (random.Random) برای انتخاب‌های تکی از فهرست‌ها و self.rng
+        (numpy Generator) برای نمونه‌های دسته‌ای یک تکرار کامل استفاده می‌شوند.
+        self.seed_sequence برای ساخت جریان‌های فرزند (مثلاً کارگرها) نگه داشته
+        می‌شود و self.seed بذر قابل بازتولید اجراست: خود SeedSequence (entropy
+        همراه با spawn_key)، تا بذر یک اجرای دسته‌ای یا جزیره فرزند جریان همان
+        فرزند را بازسازی کند و نه جریان والد.
+        """
+        self.seed_sequence = seed_sequence(seed)
+        self.seed = self.seed_sequence
+        self.random, self.rng = make_generators(self.seed_sequence)
+    
+    def setup_algorithm_parameters(self):
+        """تنظیم پارامترهای الگوریتم (OPTIONS) در هر موتور جستجو"""
+        raise NotImplementedError
+    
+    def init_search_state(self):
+        """ساخت جمعیت اولیه و وضعیت جستجو (تکرار 0)"""
+        raise NotImplementedError
+    
+    def search_step(self, state):
+        """اجرای یک تکرار/نسل روی وضعیت جستجو (population، leaders و best را به‌روز می‌کند)"""
+        raise NotImplementedError
+    
+    def run_algorithm(self, callback=None, resume_from=None):
+        """
+        اجرای کامل جستجو و بازگرداندن بهترین راه‌حل
+        
+        پارامترها:
+            callback (callable): تابع اختیاری callback(iteration, best) پس از هر تکرار
+            resume_from (str): مسیر نقطه بازیابی برای ادامه اجرای قبلی
+        """
+        for iteration, best in self.iterate(resume_from):
+            if callback is not None:
+                callback(iteration, best)
+        return self.best_solution
+    
+    def iterate(self, resume_from=None):
+        """
+        اجرای گام‌به‌گام جستجو به صورت مولد: پس از هر تکرار (شماره تکرار، بهترین راه‌حل)
+        
+        با OPTIONS['checkpoint_file'] هر checkpoint_every تکرار و در پایان اجرا وضعیت
+        کامل جستجو ذخیره می‌شود و resume_from اجرا را دقیقاً از همان نقطه ادامه می‌دهد.
+        """
+        # پروفایل پیش از ساخت جمعیت اولیه شروع می‌شود تا ارزیابی آن هم شمرده شود
+        self.start_profiling()
+        if resume_from:
+            state = self.load_search_state(resume_from)
+        else:
+            state = self.init_search_state()
+            self.begin_run()
+        checkpoint_file = self.OPTIONS.get('checkpoint_file')
+        checkpoint_every = self.OPTIONS.get('checkpoint_every') or 0
+        telemetry_every = self.OPTIONS.get('telemetry_every') or 1
+        sink = make_sink(self.OPTIONS, self.ITERATION_LABEL)
+        self.local_search = LocalSearch.from_options(self) if self.OPTIONS.get('local_search') else None
+        self._last_sample = (self.stopping.elapsed(), self.evaluations)
+        
+        try:
+            while state['iteration'] < self.OPTIONS[self.ITERATIONS_OPTION]:
+                if self.should_stop(state['best']['cost']):
+                    break
+                self.search_step(state)
+                if self.local_search is not None:
+                    self.memetic_step(state)
+                state['iteration'] += 1
+                if state['iteration'] % telemetry_every == 0:
+                    sink.record(self.progress_record(state, sink.detailed))
+                
+                if checkpoint_file and checkpoint_every and state['iteration'] % checkpoint_every == 0:
+                    self.save_search_state(state, checkpoint_file)
+                yield state['iteration'], state['best']
+        finally:
+            sink.close()
+        
+        self.finish_run(state['best']['cost'])
+        self.finish_profiling()
+        if checkpoint_file:
+            self.save_search_state(state, checkpoint_file)
+        self.best_solution = state['best']
+    
+    def memetic_step(self, state):
+        """
+        بهبود local_search_top_k راه‌حل برتر جمعیت با جستجوی محلی
+        
+        راه‌حل‌های بهبودیافته جایگزین خود در جمعیت می‌شوند و در صورت نیاز best و
+        leaders (بهترین راه‌حل‌های راهنمای موتور) را به‌روز می‌کنند.
+        """
+        population = state['population']
+        top_k = self.OPTIONS.get('local_search_top_k', 1)
+        ranked = sorted(range(len(population)), key=lambda k: population[k]['cost'])[:top_k]
+        
+        improved = []
+        with self.phase_timer.phase('local_search'):
+            for k in ranked:
+                solution = self.local_search.improve(population[k])
+                if solution is not population[k]:
+                    population[k] = solution
+                    improved.append(solution)
+        
+        for solution in improved:
+            if solution['cost'] < state['best']['cost']:
+                state['best'] = self.copy_solution(solution)
+        if improved and state['leaders']:
+            candidates = state['leaders'] + [self.copy_solution(s) for s in improved]
+            state['leaders'] = sorted(candidates, key=lambda x: x['cost'])[:len(state['leaders'])]
+    
+    def start_profiling(self):
+        """ساخت زمان‌سنج مراحل؛ با OPTIONS['profile'] پروفایل عملگرها و جملات هزینه فعال می‌شود"""
+        self.profiler = PhaseProfiler() if self.OPTIONS.get('profile') else None
+        self.phase_timer = self.profiler or PhaseTimer()
+        if hasattr(self, 'batch_evaluator'):
+            self.batch_evaluator.profiler = self.profiler
+    
+    def finish_profiling(self):
+        """چاپ جدول خلاصه پروفایل و ذخیره گزارش JSON آن (OPTIONS['profile_file'])"""
+        if self.profiler is None:
+            return
+        if self.OPTIONS.get('verbose', 1):
+            print(self.profiler.summary())
+        if self.OPTIONS.get('profile_file'):
+            self.profiler.save(self.OPTIONS['profile_file'])
+    
+    def progress_record(self, state, detailed=True):
+        """
+        رکورد تخت پیشرفت برای telemetry: هزینه بهترین/میانگین/بدترین جمعیت، سرعت
+        ارزیابی و زمان هر مرحله از رکورد قبلی، و در حالت detailed تعداد نقض هر
+        جمله هزینه در بهترین راه‌حل
+        """
+        costs = [solution['cost'] for solution in state['population']]
+        elapsed = self.stopping.elapsed()
+        last_elapsed, last_evaluations = self._last_sample
+        self._last_sample = (elapsed, self.evaluations)
+        interval = elapsed - last_elapsed
+        
+        record = {
+            'engine': type(self).__name__,
+            'iteration': state['iteration'],
+            'best_cost': state['best']['cost'],
+            'mean_cost': sum(costs) / len(costs) if costs else float('inf'),
+            'worst_cost': max(costs) if costs else float('inf'),
+            'evaluations': self.evaluations,
+            'evals_per_sec': (self.evaluations - last_evaluations) / interval if interval > 0 else 0.0,
+            'elapsed': elapsed
+        }
+        for name, seconds in self.phase_timer.take().items():
+            record[f"time_{name}"] = seconds
+        if detailed:
+            for name, count in self.violation_counts(state['best']).items():
+                record[f"violations_{name}"] = count
+        return record
+    
+    def violation_counts(self, solution):
+        """تعداد نقض هر جمله هزینه برای یک راه‌حل (با فرم دسته‌ای ارزیاب)"""
+        if not hasattr(self, 'batch_evaluator'):
+            self.batch_evaluator = BatchCostEvaluator.from_scheduler(self)
+        encoded = self.encode_population([solution])
+        counts = self.batch_evaluator.violation_counts(encoded.genes, encoded.course_order)
+        return {name: float(values[0]) for name, values in counts.items()}
+    
+    def save_search_state(self, state, path):
+        """ذخیره وضعیت کامل جستجو، حالت مولدهای تصادفی و شمارنده‌ها در نقطه بازیابی"""
+        key = self.SOLUTION_KEY
+        return save_checkpoint(path, {
+            'engine': type(self).__name__,
+            'problem_key': self.problem.key,
+            'iteration': state['iteration'],
+            'seed': self.seed_sequence,
+            'population': encode_solutions(self.index, state['population'], key),
+            'leaders': encode_solutions(self.index, state['leaders'], key),
+            'best': encode_solutions(self.index, [state['best']], key),
+            'random_state': self.random.getstate(),
+            'numpy_state': self.rng.bit_generator.state,
+            'place_usage': dict(self.place_usage),
+            'evaluations': self.evaluations,
+            'stopping': self.stopping.state()
+        })
+    
+    def load_search_state(self, path):
+        """بازیابی وضعیت جستجو از نقطه بازیابی برای ادامه بیت‌به‌بیت یکسان اجرا"""
+        payload = load_checkpoint(path)
+        if payload['engine'] != type(self).__name__ or payload['problem_key'] != self.problem.key:
+            raise ValueError(f"نقطه بازیابی '{path}' متعلق به این موتور یا این فایل پیکربندی نیست")
+        
+        key = self.SOLUTION_KEY
+        self.seed_sequence = self.seed = payload['seed']
+        self.random.setstate(payload['random_state'])
+        self.rng.bit_generator.state = payload['numpy_state']
+        self.place_usage = defaultdict(int, payload['place_usage'])
+        self.evaluations = payload['evaluations']
+        self.begin_run()
+        self.stopping.restore(payload['stopping'])
+        return {
+            'iteration': payload['iteration'],
+            'population': decode_solutions(self.index, payload['population'], key),
+            'leaders': decode_solutions(self.index, payload['leaders'], key),
+            'best': decode_solutions(self.index, payload['best'], key)[0]
+        }
+    
+    def begin_run(self):
+        """شروع شمارش معیارهای توقف (زمان، بدون بهبود) برای یک اجرای جدید"""
+        self.stopping = StoppingCriteria.from_options(self.OPTIONS)
+        self.stop_reason = None
+    
+    def should_stop(self, best_cost):
+        """بررسی معیارهای توقف در ابتدای هر تکرار/نسل"""
+        self.stop_reason = self.stopping.check(best_cost, self.evaluations)
+        return self.stop_reason is not None
+    
+    def finish_run(self, best_cost):
+        """ثبت و گزارش دلیل توقف پس از پایان حلقه جستجو"""
+        if self.stop_reason is None:
+            self.stop_reason = self.stopping.check(best_cost, self.evaluations) or 'max_iterations'
+        if self.OPTIONS.get('verbose', 1):
+            print(f"توقف: {STOP_REASONS[self.stop_reason]} (بهترین هزینه = {best_cost}، "
+                  f"زمان = {self.stopping.elapsed():.1f} ثانیه، ارزیابی‌ها = {self.evaluations})")
+    
+    def load_and_prepare_data(self):
+        """بارگذاری و آماده‌سازی داده‌ها از فایل YAML"""
+        # بارگذاری داده‌های اصلی
+        self.places = {p['code']: p for p in self.config['places']}
+        self.teachers = {t['code']: t for t in self.config['teachers']}
+        self.courses = {c['code']: c for c in self.config['courses']}
+        self.time_slots = {ts['id']: ts for ts in self.config['settings']['time_slots']}
+        self.days = self.config['settings']['days_of_week']
+        self.constraints = self.config.get('constraints', [])
+        self.slot_keys = [(day, slot) for day in range(1, len(self.days) + 1) for slot in self.time_slots]
+        
+        # جداول نگاشت کدها به اندیس‌های صحیح برای نمایش فشرده جمعیت
+        self.index = self.problem.index
+        self.compile_constraints()
+        # جداول امکان‌پذیری (اساتید/مکان‌های مجاز هر درس و زمان‌های عدم حضور اساتید)
+        self.feasibility = FeasibilityTables.from_problem(self.problem)
+        
+        # آماده‌سازی داده‌ها
+        self.prepare_courses_data()
+        self.validate_data()
+    
+    def compile_constraints(self):
+        """کامپایل یک‌باره بخش constraints به کرنل‌های محدودیت ثبت‌شده در constraints.py"""
+        self.constraint_kernels = compile_constraint_kernels(
+            self.constraints, self.index, self.teachers, self.time_slots
+        )
+    
+    def prepare_courses_data(self):
+        """آماده‌سازی داده‌های دروس"""
+        self.course_list = [c for c in self.courses.values() if not c.get('fixed', False)]
+        
+        for course in self.course_list:
+            # تنظیم اساتید برای درس
+            course['teachers'] = [
+                self.teachers[t] for t in course.get('teachers', [])
+                if t in self.teachers
+            ]
+            # تعیین مکان‌های مناسب
+            self.set_suitable_places_for_course(course)
+        
+        # تنظیم پیش‌نیازها و هم‌نیازها
+        self.setup_prerequisites()
+    
+    def set_suitable_places_for_course(self, course):
+        """تعیین مکان‌های مناسب برای یک درس از جداول امکان‌پذیری کامپایل‌شده"""
+        codes = self.feasibility.places_for[course['code']]
+        if self.OPTIONS['capacity_aware_places']:
+            # فقط مکان‌های با ظرفیت کافی، مگر اینکه هیچ‌کدام وجود نداشته باشد
+            codes = self.feasibility.roomy_places_for[course['code']] or codes
+        course['suitable_places'] = [self.places[code] for code in codes]
+    
+    def setup_prerequisites(self):
+        """تنظیم ساختار پیش‌نیازها و هم‌نیازها"""
+        self.prerequisites = {c['code']: c.get('prerequisites', []) for c in self.course_list}
+        self.corequisites = {c['code']: c.get('corequisites', []) for c in self.course_list}
+        # یال‌های صحیح کامپایل‌شده: اندیس درس -> اندیس‌های پیش‌نیاز/هم‌نیاز (-1 برای کد ناشناخته)
+        self.prereq_of = self.requisite_lists(self.problem.prereq_edges)
+        self.coreq_of = self.requisite_lists(self.problem.coreq_edges)
+    
+    def requisite_lists(self, edges):
+        """تبدیل فهرست یال‌های (درس، پیش‌نیاز) به فهرست مجاورت بر حسب اندیس درس"""
+        lists = [[] for _ in self.index.course_codes]
+        for course_idx, req_idx in edges.tolist():
+            lists[course_idx].append(req_idx)
+        return lists
+    
+    def validate_data(self):
+        """
+        اعتبارسنجی داده‌های ورودی
+        
+        OPTIONS['verbose']: 0 بی‌صدا، 1 فقط هشدارها، 2 همراه با مکان‌های مناسب هر درس
+        """
+        verbose = self.OPTIONS.get('verbose', 1)
+        if not verbose:
+            return
+        limited_places_courses = []
+        for course in self.course_list:
+            if not course['suitable_places']:
+                print(f"⚠️ هشدار: برای درس '{course['name']}' هیچ مکان مناسبی یافت نشد!")
+                limited_places_courses.append((course['name'], 0))
+            else:
+                num_places = len(course['suitable_places'])
+                if verbose >= 2:
+                    print(f"درس '{course['name']}': مکان‌های مناسب = {[p['code'] for p in course['suitable_places']]}")
+                if num_places <= 2:
+                    limited_places_courses.append((course['name'], num_places))
+            if not course.get('teachers', []):
+                print(f"⚠️ هشدار: برای درس '{course['name']}' هیچ استاد مناسبی یافت نشد!")
+        
+        if limited_places_courses:
+            print("\n⚠️ دروس با مکان‌های محدود:")
+            for course_name, num_places in limited_places_courses:
+                print(f"- {course_name}: {num_places} مکان مناسب")
+    
+    def initialize_population(self):
+        """
+        ایجاد جمعیت اولیه با راهبرد OPTIONS['init_strategy']
+        
+        'random': زمان‌بندی‌های تصادفی اصلاح‌شده با fix_schedule_conflicts
+        'presolve': نسخه‌های جابه‌جاشده یک زمان‌بندی بدون تداخل از Presolver
+        'coloring': زمان‌بندی‌های ساخته‌شده با رنگ‌آمیزی DSATUR گراف تداخل
+        """
+        strategy = self.OPTIONS.get('init_strategy', 'random')
+        if strategy == 'random':
+            return self.random_population()
+        if strategy == 'presolve':
+            return self.presolved_population()
+        if strategy == 'coloring':
+            initializer = ColoringInitializer(self)
+            return [initializer.build() for _ in range(self.OPTIONS[self.POPULATION_OPTION])]
+        raise ValueError(f"راهبرد جمعیت اولیه ناشناخته: {strategy}")
+    
+    def presolved_population(self):
+        """
+        جمعیت اولیه از زمان‌بندی پیش‌حل‌شده: فرد اول خود آن و بقیه با جابه‌جایی
+        کسر presolve_perturbation از کلاس‌ها به زمان‌های آزاد
+        """
+        presolver = Presolver(self)
+        base = presolver.solve()
+        verbose = self.OPTIONS.get('verbose', 1)
+        if verbose >= 2 or (verbose and presolver.stats['unresolved']):
+            print(presolver.summary())
+        
+        rate = self.OPTIONS.get('presolve_perturbation', 0.2)
+        population = []
+        for k in range(self.OPTIONS[self.POPULATION_OPTION]):
+            solution = self.copy_solution(base)
+            if k > 0:
+                presolver.perturb(solution, rate)
+            population.append(solution)
+        
+        self.place_usage.clear()
+        for course in base[self.SOLUTION_KEY]:
+            self.place_usage[course['place_code']] += 1
+        return population
+    
+    def random_population(self):
+        """ایجاد جمعیت اولیه از زمان‌بندی‌های تصادفی"""
+        population = []
+        
+        for _ in range(self.OPTIONS[self.POPULATION_OPTION]):
+            solution = {self.SOLUTION_KEY: CowList(), 'cost': float('inf')}
+            self.place_usage.clear()  # ریست کردن آمار استفاده از مکان‌ها
+            
+            # ابتدا دروس با مکان‌های مناسب کمتر تخصیص داده می‌شوند
+            for course in sorted(self.course_list, key=lambda c: len(c['suitable_places'])):
+                teacher = self.select_random_teacher_for_course(course)
+                place = self.select_balanced_place_for_course(course, solution)
+                if not teacher or not place:
+                    continue
+                
+                slot_id = self.random.choice(list(self.time_slots.keys()))
+                day = self.random.randint(1, len(self.days))
+                
+                solution[self.SOLUTION_KEY].append({
+                    'course_code': course['code'],
+                    'teacher_code': teacher['code'],
+                    'place_code': place['code'],
+                    'slot_id': slot_id,
+                    'day': day
+                })
+                self.place_usage[place['code']] += 1
+            
+            solution = self.fix_schedule_conflicts(solution)
+            population.append(solution)
+        
+        return population
+    
+    def select_random_teacher_for_course(self, course):
+        """انتخاب تصادفی استاد برای یک درس"""
+        suitable_teachers = course['teachers']
+        return self.random.choice(suitable_teachers) if suitable_teachers else None
+    
+    def compatible_teachers(self, course):
+        """کد اساتید درس که جنسیت آن‌ها با درس سازگار است (در صورت نبود، همه اساتید درس)"""
+        codes = [t['code'] for t in course['teachers']]
+        compatible = set(self.feasibility.teachers_for.get(course['code'], []))
+        return [code for code in codes if code in compatible] or codes
+    
+    def select_balanced_place_for_course(self, course, solution):
+        """انتخاب مکان با اولویت مکان‌های کمتر استفاده‌شده"""
+        suitable_places = course['suitable_places']
+        if not suitable_places:
+            return None
+        
+        # محاسبه وزن برای هر مکان بر اساس تعداد استفاده
+        weights = []
+        max_usage = max(self.place_usage.values()) if self.place_usage else 0
+        for place in suitable_places:
+            usage_count = self.place_usage[place['code']]
+            # اگر مکان بیش از حد مجاز استفاده شده، وزن صفر می‌دهیم
+            if usage_count >= self.max_place_usage:
+                weight = 0.0
+            else:
+                # وزن معکوس با جریمه بسیار قوی
+                weight = 1.0 / (1.0 + usage_count * 10.0) if max_usage < 10 else 1.0 / (1.0 + usage_count * 20.0)
+            weights.append(weight)
+        
+        # اگر همه وزن‌ها صفر بودند، مکان تصادفی انتخاب می‌کنیم
+        if sum(weights) == 0:
+            available_places = [p for p in suitable_places if self.place_usage[p['code']] < self.max_place_usage]
+            return self.random.choice(available_places) if available_places else self.random.choice(suitable_places)
+        
+        # نرمال‌سازی وزن‌ها
+        total_weight = sum(weights)
+        weights = [w / total_weight for w in weights]
+        
+        # انتخاب مکان با احتمال وزن‌دهی‌شده
+        return self.random.choices(suitable_places, weights=weights, k=1)[0]
+    
+    def encode_population(self, population):
+        """تبدیل جمعیت زمان‌بندی‌ها به آرایه فشرده (جمعیت × دروس × 4) برای ارزیابی و ذخیره"""
+        return EncodedPopulation.from_schedules(self.index, population, self.SOLUTION_KEY)
+    
+    def decode_population(self, encoded):
+        """تبدیل جمعیت فشرده به قالب دیکشنری (قابل استفاده در save_schedule_to_file)"""
+        schedules = encoded.to_schedules(self.SOLUTION_KEY)
+        for solution in schedules:
+            solution[self.SOLUTION_KEY] = CowList(solution[self.SOLUTION_KEY])
+        return schedules
+    
+    def cost_function(self, population):
+        """محاسبه هزینه هر زمان‌بندی در جمعیت"""
+        self.evaluations += len(population)
+        if self.OPTIONS['vectorized_cost'] and population:
+            return self.batch_cost_function(population)
+        
+        profiler = self.profiler
+        for solution in population:
+            cost = 0
+            with term_phase(profiler, 'teacher_conflicts'):
+                cost += self.calculate_teacher_conflicts(solution)
+            with term_phase(profiler, 'place_conflicts'):
+                cost += self.calculate_place_conflicts(solution)
+            with term_phase(profiler, 'workload'):
+                cost += self.calculate_workload_issues(solution)
+            with term_phase(profiler, 'capacity'):
+                cost += self.calculate_capacity_issues(solution)
+            with term_phase(profiler, 'course_times'):
+                times = self.course_times(solution)
+            with term_phase(profiler, 'prerequisite'):
+                cost += self.calculate_prerequisite_violations(solution, times)
+            with term_phase(profiler, 'corequisite'):
+                cost += self.calculate_corequisite_violations(solution, times)
+            cost += self.calculate_constraint_violations(solution)
+            with term_phase(profiler, 'place_usage'):
+                cost += self.calculate_place_usage_imbalance(solution)
+            with term_phase(profiler, 'gender_mismatch'):
+                cost += self.calculate_gender_mismatch(solution)
+            with term_phase(profiler, 'place_overuse'):
+                cost += self.calculate_place_overuse(solution)
+            solution['cost'] = cost
+        
+        return population
+    
+    def copy_solution(self, solution):
+        """کپی O(1) راه‌حل با اشتراک ساختاری فهرست کلاس‌ها (بدون شمارنده‌های اشغال)"""
+        return {self.SOLUTION_KEY: solution[self.SOLUTION_KEY].copy(), 'cost': solution['cost']}
+    
+    def batch_cost_function(self, population):
+        """محاسبه برداری هزینه کل جمعیت در یک فراخوانی"""
+        if not hasattr(self, 'batch_evaluator'):
+            self.batch_evaluator = BatchCostEvaluator.from_scheduler(self)
+        
+        with term_phase(self.profiler, 'encode'):
+            encoded = self.encode_population(population)
+        costs = self.batch_evaluator.evaluate(encoded)
+        for solution, cost in zip(population, costs.tolist()):
+            solution['cost'] = cost
+        return population
+    
+    def calculate_teacher_conflicts(self, solution):
+        """محاسبه هزینه تداخل استادان"""
+        teacher_slots = defaultdict(list)
+        conflict_cost = 0
+        
+        for course in solution[self.SOLUTION_KEY]:
+            teacher = course['teacher_code']
+            slot = course['slot_id']
+            day = course['day']
+            slot_key = (day, slot)
+            
+            if slot_key in teacher_slots[teacher]:
+                conflict_cost += self.OPTIONS['teacher_conflict_cost']
+            teacher_slots[teacher].append(slot_key)
+        
+        return conflict_cost
+    
+    def calculate_place_conflicts(self, solution):
+        """محاسبه هزینه تداخل مکان‌ها"""
+        place_slots = defaultdict(list)
+        conflict_cost = 0
+        
+        for course in solution[self.SOLUTION_KEY]:
+            place = course['place_code']
+            slot = course['slot_id']
+            day = course['day']
+            slot_key = (day, slot)
+            
+            if slot_key in place_slots[place]:
+                conflict_cost += self.OPTIONS['place_conflict_cost']
+            place_slots[place].append(slot_key)
+        
+        return conflict_cost
+    
+    def calculate_workload_issues(self, solution):
+        """محاسبه هزینه بارکاری نامناسب استادان"""
+        teacher_units = defaultdict(int)
+        workload_cost = 0
+        
+        for course in solution[self.SOLUTION_KEY]:
+            teacher = course['teacher_code']
+            units = self.courses[course['course_code']]['units']
+            teacher_units[teacher] += units
+        
+        for teacher, units in teacher_units.items():
+            min_units = self.teachers[teacher]['min_units']
+            max_units = self.teachers[teacher]['max_units']
+            
+            if units < min_units or units > max_units:
+                workload_cost += self.OPTIONS['workload_cost']
+        
+        return workload_cost
+    
+    def calculate_capacity_issues(self, solution):
+        """محاسبه هزینه عدم تناسب ظرفیت کلاس‌ها"""
+        capacity_cost = 0
+        
+        for course in solution[self.SOLUTION_KEY]:
+            place_capacity = self.places[course['place_code']]['capacity']
+            expected_students = self.courses[course['course_code']].get('expected_students', 30)
+            
+            if place_capacity < expected_students:
+                capacity_cost += self.OPTIONS['capacity_cost']
+        
+        return capacity_cost
+    
+    def calculate_prerequisite_violations(self, solution, times=None):
+        """محاسبه هزینه نقض پیش‌نیازها (O(دروس + یال‌ها) با نمایه زمان دروس)"""
+        if times is None:
+            times = self.course_times(solution)
+        violation_cost = 0
+        course_index = self.index.course_index
+        
+        for course in solution[self.SOLUTION_KEY]:
+            course_slot = course['slot_id']
+            course_day = course['day']
+            
+            for prereq in self.prereq_of[course_index[course['course_code']]]:
+                if not self.is_prerequisite_satisfied(prereq, course_day, course_slot, times):
+                    violation_cost += self.OPTIONS['prereq_cost']
+        
+        return violation_cost
+    
+    def calculate_corequisite_violations(self, solution, times=None):
+        """محاسبه هزینه نقض هم‌نیازها (O(دروس + یال‌ها) با نمایه زمان دروس)"""
+        if times is None:
+            times = self.course_times(solution)
+        violation_cost = 0
+        course_index = self.index.course_index
+        
+        for course in solution[self.SOLUTION_KEY]:
+            course_slot = course['slot_id']
+            course_day = course['day']
+            
+            for coreq in self.coreq_of[course_index[course['course_code']]]:
+                if not self.is_corequisite_satisfied(coreq, course_day, course_slot, times):
+                    violation_cost += self.OPTIONS['coreq_cost']
+        
+        return violation_cost
+    
+    def calculate_constraint_violations(self, solution):
+        """محاسبه هزینه بخش constraints به صورت مجموع کرنل‌های کامپایل‌شده"""
+        violation_cost = 0
+        for kernel in self.constraint_kernels:
+            with term_phase(self.profiler, kernel.type_name):
+                violation_cost += kernel.scalar(solution[self.SOLUTION_KEY]) * self.OPTIONS[kernel.cost_option]
+        return violation_cost
+    
+    def calculate_place_usage_imbalance(self, solution):
+        """محاسبه هزینه عدم توزیع متوازن استفاده از مکان‌ها"""
+        usage_counts = defaultdict(int)
+        for course in solution[self.SOLUTION_KEY]:
+            usage_counts[course['place_code']] += 1
+        
+        if not usage_counts:
+            return 0
+        
+        max_usage = max(usage_counts.values())
+        min_usage = min(usage_counts.values())
+        imbalance = max_usage - min_usage
+        
+        return imbalance * self.OPTIONS['place_usage_cost']
+    
+    def calculate_place_overuse(self, solution):
+        """محاسبه هزینه استفاده بیش از حد از یک مکان"""
+        usage_counts = defaultdict(int)
+        for course in solution[self.SOLUTION_KEY]:
+            usage_counts[course['place_code']] += 1
+        
+        overuse_cost = 0
+        avg_usage = sum(usage_counts.values()) / len(usage_counts) if usage_counts else 0
+        for count in usage_counts.values():
+            if count > avg_usage * 1.5 or count > self.max_place_usage:
+                overuse_cost += (count - avg_usage) * self.OPTIONS['place_overuse_cost']
+        
+        return overuse_cost
+    
+    def calculate_gender_mismatch(self, solution):
+        """محاسبه هزینه عدم تطابق جنسیت و تداخل زمانی کلاس‌های خانم‌ها و آقایان"""
+        mismatch_cost = 0
+        slot_gender = defaultdict(list)
+        
+        for course in solution[self.SOLUTION_KEY]:
+            course_gender = self.courses[course['course_code']].get('gender', 0)
+            place_gender = self.places[course['place_code']].get('gender', 0)
+            teacher_gender = self.teachers[course['teacher_code']].get('gender', 0)
+            slot_key = (course['day'], course['slot_id'], course['place_code'])
+            
+            # بررسی تطابق جنسیت درس، استاد، و مکان
+            if course_gender != 0:
+                if place_gender != 0 and place_gender != course_gender:
+                    mismatch_cost += self.OPTIONS['gender_mismatch_cost']
+                if teacher_gender != course_gender:
+                    mismatch_cost += self.OPTIONS['gender_mismatch_cost']
+            
+            # بررسی تداخل زمانی کلاس‌های خانم‌ها و آقایان
+            if course_gender != 0:
+                slot_gender[slot_key].append(course_gender)
+        
+        # جریمه برای تداخل جنسیتی در یک اسلات و مکان
+        for slot_key, genders in slot_gender.items():
+            if len(set(genders)) > 1:
+                mismatch_cost += self.OPTIONS['gender_mismatch_cost']
+        
+        return mismatch_cost
+    
+    def course_times(self, solution):
+        """نمایه اندیس درس -> (روز، اسلات) اولین تخصیص آن (یک بار برای هر ارزیابی)"""
+        times = {}
+        course_index = self.index.course_index
+        for c in solution[self.SOLUTION_KEY]:
+            times.setdefault(course_index[c['course_code']], (c['day'], c['slot_id']))
+        return times
+    
+    def is_prerequisite_satisfied(self, prereq_idx, current_day, current_slot, times):
+        """بررسی آیا پیش‌نیاز (اندیس درس) قبل از زمان فعلی برگزار می‌شود"""
+        prereq_time = times.get(prereq_idx)
+        return prereq_time is not None and prereq_time < (current_day, current_slot)
+    
+    def is_corequisite_satisfied(self, coreq_idx, current_day, current_slot, times):
+        """بررسی آیا هم‌نیاز (اندیس درس) در همان روز و اسلات مجاور برگزار می‌شود"""
+        coreq_time = times.get(coreq_idx)
+        return coreq_time is not None and coreq_time[0] == current_day and abs(coreq_time[1] - current_slot) <= 1
+    
+    def fix_schedule_conflicts(self, solution):
+        """رفع تداخل‌های زمانی در زمان‌بندی"""
+        teacher_slots = defaultdict(list)
+        place_slots = defaultdict(list)
+        
+        # جمع‌آوری تمام تخصیص‌های زمانی (با اندیس کلاس برای کپی هنگام نوشتن)
+        for j, course in enumerate(solution[self.SOLUTION_KEY]):
+            slot_key = (course['day'], course['slot_id'])
+            teacher_slots[course['teacher_code']].append((slot_key, j))
+            place_slots[course['place_code']].append((slot_key, j))
+        
+        # نمایه اشغال استاد/مکان برای یافتن اسلات آزاد بدون پیمایش زمان‌بندی
+        occupancy = ScheduleOccupancy(solution[self.SOLUTION_KEY], self.slot_keys, self.feasibility.blocked_keys)
+        
+        # رفع تداخل‌های استاد
+        for teacher, slots in teacher_slots.items():
+            slot_counts = defaultdict(list)
+            for slot_key, j in slots:
+                slot_counts[slot_key].append(j)
+            
+            for slot_key, indices in slot_counts.items():
+                if len(indices) > 1:
+                    for j in indices[1:]:
+                        self.reassign_course_slot(solution[self.SOLUTION_KEY].mutable(j), solution, occupancy)
+        
+        # رفع تداخل‌های مکان
+        for place, slots in place_slots.items():
+            slot_counts = defaultdict(list)
+            for slot_key, j in slots:
+                slot_counts[slot_key].append(j)
+            
+            for slot_key, indices in slot_counts.items():
+                if len(indices) > 1:
+                    for j in indices[1:]:
+                        self.reassign_course_slot(solution[self.SOLUTION_KEY].mutable(j), solution, occupancy)
+        
+        return solution
+    
+    def reassign_course_slot(self, course, solution, occupancy=None):
+        """تخصیص مجدد اسلات زمانی برای رفع تداخل"""
+        if occupancy is None:
+            occupancy = ScheduleOccupancy(solution[self.SOLUTION_KEY], self.slot_keys, self.feasibility.blocked_keys)
+        
+        occupancy.remove(course)
+        for _ in range(self.OPTIONS['max_place_retries'] + 1):
+            # اسلات‌هایی که استاد و مکان هر دو در آن آزادند (تفاضل مجموعه‌ها)
+            free_keys = occupancy.free_keys(course['teacher_code'], course['place_code'])
+            if free_keys:
+                course['day'], course['slot_id'] = self.random.choice(sorted(free_keys))
+                break
+            
+            # اگر اسلات بدون تداخل یافت نشد، مکان را تغییر دهید
+            new_place = self.select_balanced_place_for_course(self.courses[course['course_code']], solution)
+            if not new_place:
+                break
+            self.place_usage[course['place_code']] -= 1
+            course['place_code'] = new_place['code']
+            self.place_usage[course['place_code']] += 1
+        occupancy.add(course)
+    
+    def repair_solution(self, solution):
+        """بررسی و اصلاح یک راه‌حل غیرممکن (جنسیت و تداخل‌ها)"""
+        for j, course in enumerate(solution[self.SOLUTION_KEY]):
+            if self.has_course_issues(course):
+                self.fix_course_issues(solution[self.SOLUTION_KEY].mutable(j))
+        return self.fix_schedule_conflicts(solution)
+    
+    def has_course_issues(self, course):
+        """آیا جنسیت استاد یا مکان با درس مطابقت ندارد"""
+        course_gender = self.courses[course['course_code']].get('gender', 0)
+        if course_gender == 0:
+            return False
+        teacher_gender = self.teachers[course['teacher_code']].get('gender', 0)
+        place_gender = self.places[course['place_code']].get('gender', 0)
+        return teacher_gender != course_gender or (place_gender != 0 and place_gender != course_gender)
+    
+    def fix_course_issues(self, course):
+        """اصلاح مشکلات یک کلاس"""
+        self.fix_teacher_gender_issue(course)
+        self.fix_place_gender_issue(course)
+    
+    def fix_teacher_gender_issue(self, course):
+        """اصلاح مشکل تطابق جنسیت استاد و درس"""
+        course_gender = self.courses[course['course_code']].get('gender', 0)
+        teacher_gender = self.teachers[course['teacher_code']].get('gender', 0)
+        
+        if course_gender != 0 and teacher_gender != course_gender:
+            suitable_teachers = self.feasibility.teachers_for[course['course_code']]
+            if suitable_teachers:
+                course['teacher_code'] = self.random.choice(suitable_teachers)
+    
+    def fix_place_gender_issue(self, course):
+        """اصلاح مشکل تطابق جنسیت دانشجویان و مکان"""
+        course_gender = self.courses[course['course_code']].get('gender', 0)
+        place_gender = self.places[course['place_code']].get('gender', 0)
+        
+        if course_gender != 0 and place_gender != 0 and place_gender != course_gender:
+            suitable_places = self.courses[course['course_code']]['suitable_places']
+            if suitable_places:
+                course['place_code'] = self.select_balanced_place_for_course(
+                    self.courses[course['course_code']], {}
+                )['code']
+    
+    def export_schedule(self, solution, path, fmt=None):
+        """خروجی ماشین‌خوان زمان‌بندی (csv، jsonl یا npz) یا گزارش متنی؛ قالب از پسوند فایل"""
+        return export_schedule(self, solution, path, fmt)
+    
+    def save_schedule_to_file(self, solution, filename="schedule_output.txt"):
+        """ذخیره زمان‌بندی نهایی در فایل متنی (گزارش قابل خواندن برای انسان)"""
+        with open(filename, 'w', encoding='utf-8') as file:
+            file.write("زمان‌بندی بهینه کلاس‌های دانشگاه تربیت بدنی - بهار 1403\n")
+            file.write("=" * 100 + "\n")
+            file.write(f"{'روز':<10}{'زمان':<15}{'درس':<35}{'استاد':<30}{'مکان':<20}{'ظرفیت':<10}{'جنسیت':<10}\n")
+            file.write("-" * 100 + "\n")
+            
+            sorted_courses = sorted(
+                solution[self.SOLUTION_KEY],
+                key=lambda x: (x['day'], self.time_slots[x['slot_id']]['start'])
+            )
+            
+            for course in sorted_courses:
+                day = self.days[course['day']-1]
+                time = f"{self.time_slots[course['slot_id']]['start']}-{self.time_slots[course['slot_id']]['end']}"
+                course_name = self.courses[course['course_code']]['name'][:34]
+                teacher_name = self.teachers[course['teacher_code']]['full_name'][:29]
+                place_name = self.places[course['place_code']]['name'][:19]
+                place_capacity = self.places[course['place_code']]['capacity']
+                course_gender = self.courses[course['course_code']].get('gender', 0)
+                gender_str = 'خانم' if course_gender == 2 else 'آقا' if course_gender == 1 else 'مشترک'
+                
+                file.write(f"{day:<10}{time:<15}{course_name:<35}{teacher_name:<30}{place_name:<20}{place_capacity:<10}{gender_str:<10}\n")
+            
+            file.write("\n" + "=" * 100 + "\n")
+            file.write(f"هزینه نهایی زمان‌بندی: {solution['cost']}\n")
+            file.write(f"تعداد کلاس‌ها: {len(solution[self.SOLUTION_KEY])}\n")
+            
+            teacher_stats = self.calculate_teacher_statistics(solution)
+            file.write("\nآمار تدریس اساتید:\n")
+            file.write("-" * 50 + "\n")
+            for teacher_code, count in sorted(teacher_stats.items(), key=lambda x: -x[1]):
+                teacher_name = self.teachers[teacher_code]['full_name']
+                file.write(f"{teacher_name:<30}: {count} کلاس\n")
+            
+            place_stats = self.calculate_place_statistics(solution)
+            file.write("\nآمار استفاده از مکان‌ها:\n")
+            file.write("-" * 50 + "\n")
+            for place_code, count in sorted(place_stats.items(), key=lambda x: -x[1]):
+                place_name = self.places[place_code]['name']
+                file.write(f"{place_name:<30}: {count} کلاس\n")
+            
+            file.write("\nمحدودیت‌های نقض‌شده:\n")
+            file.write("-" * 50 + "\n")
+            violations = [
+                (self.calculate_teacher_conflicts(solution) // self.OPTIONS['teacher_conflict_cost'], "تداخل زمان استادان"),
+                (self.calculate_place_conflicts(solution) // self.OPTIONS['place_conflict_cost'], "تداخل زمان مکان‌ها"),
+                (self.calculate_workload_issues(solution) // self.OPTIONS['workload_cost'], "مشکل در بار کاری استادان"),
+                (self.calculate_capacity_issues(solution) // self.OPTIONS['capacity_cost'], "عدم تناسب ظرفیت کلاس‌ها"),
+                (self.calculate_prerequisite_violations(solution) // self.OPTIONS['prereq_cost'], "نقض پیش‌نیازها"),
+                (self.calculate_corequisite_violations(solution) // self.OPTIONS['coreq_cost'], "نقض هم‌نیازها"),
+                *[(kernel.scalar(solution[self.SOLUTION_KEY]), kernel.description) for kernel in self.constraint_kernels],
+                (self.calculate_place_usage_imbalance(solution) // self.OPTIONS['place_usage_cost'], "عدم توزیع متوازن مکان‌ها"),
+                (self.calculate_place_overuse(solution) // self.OPTIONS['place_overuse_cost'], "استفاده بیش از حد از یک مکان"),
+                (self.calculate_gender_mismatch(solution) // self.OPTIONS['gender_mismatch_cost'], "عدم تطابق جنسیت یا تداخل زمانی")
+            ]
+            
+            for count, desc in violations:
+                if count > 0:
+                    file.write(f"- {desc}: {count} مورد\n")
+            if not any(count > 0 for count, _ in violations):
+                file.write("هیچ محدودیتی نقض نشده است.\n")
+            
+            # گزارش تداخل‌های خاص
+            file.write("\nگزارش تداخل‌های خاص:\n")
+            file.write("-" * 50 + "\n")
+            teacher_conflicts = self.get_teacher_conflicts(solution)
+            place_conflicts = self.get_place_conflicts(solution)
+            
+            if teacher_conflicts:
+                file.write("تداخل‌های استادان:\n")
+                for teacher, slots in teacher_conflicts.items():
+                    file.write(f"استاد {self.teachers[teacher]['full_name']}:\n")
+                    for slot, courses in slots.items():
+                        file.write(f"  اسلات {slot}: {[self.courses[c['course_code']]['name'] for c in courses]}\n")
+            else:
+                file.write("هیچ تداخل استادی یافت نشد.\n")
+            
+            if place_conflicts:
+                file.write("تداخل‌های مکان‌ها:\n")
+                for place, slots in place_conflicts.items():
+                    file.write(f"مکان {self.places[place]['name']}:\n")
+                    for slot, courses in slots.items():
+                        file.write(f"  اسلات {slot}: {[self.courses[c['course_code']]['name'] for c in courses]}\n")
+            else:
+                file.write("هیچ تداخل مکانی یافت نشد.\n")
+            
+            file.write("\nپایان فایل زمان‌بندی\n")
+    
+    def get_teacher_conflicts(self, solution):
+        """یافتن تداخل‌های خاص استادان"""
+        teacher_slots = defaultdict(list)
+        conflicts = defaultdict(lambda: defaultdict(list))
+        
+        for course in solution[self.SOLUTION_KEY]:
+            teacher = course['teacher_code']
+            slot = (course['day'], course['slot_id'])
+            teacher_slots[(teacher, slot)].append(course)
+        
+        for (teacher, slot), courses in teacher_slots.items():
+            if len(courses) > 1:
+                conflicts[teacher][slot] = courses
+        
+        return conflicts
+    
+    def get_place_conflicts(self, solution):
+        """یافتن تداخل‌های خاص مکان‌ها"""
+        place_slots = defaultdict(list)
+        conflicts = defaultdict(lambda: defaultdict(list))
+        
+        for course in solution[self.SOLUTION_KEY]:
+            place = course['place_code']
+            slot = (course['day'], course['slot_id'])
+            place_slots[(place, slot)].append(course)
+        
+        for (place, slot), courses in place_slots.items():
+            if len(courses) > 1:
+                conflicts[place][slot] = courses
+        
+        return conflicts
+    
+    def calculate_teacher_statistics(self, solution):
+        """محاسبه آمار تدریس اساتید"""
+        teacher_stats = defaultdict(int)
+        for course in solution[self.SOLUTION_KEY]:
+            teacher_stats[course['teacher_code']] += 1
+        return teacher_stats
+    
+    def calculate_place_statistics(self, solution):
+        """محاسبه آمار استفاده از مکان‌ها"""
+        place_stats = defaultdict(int)
+        for course in solution[self.SOLUTION_KEY]:
+            place_stats[course['place_code']] += 1
+        return place_stats
+    
+    def print_schedule(self, solution):
+        """چاپ زمان‌بندی نهایی در کنسول"""
+        print("\nزمان‌بندی بهینه کلاس‌ها:")
+        print("=" * 100)
+        print(f"{'روز':<10}{'زمان':<15}{'درس':<35}{'استاد':<30}{'مکان':<20}{'ظرفیت':<10}{'جنسیت':<10}")
+        print("-" * 100)
+        
+        sorted_courses = sorted(
+            solution[self.SOLUTION_KEY],
+            key=lambda x: (x['day'], self.time_slots[x['slot_id']]['start'])
+        )
+        
+        for course in sorted_courses:
+            day = self.days[course['day']-1]
+            time = f"{self.time_slots[course['slot_id']]['start']}-{self.time_slots[course['slot_id']]['end']}"
+            course_name = self.courses[course['course_code']]['name'][:34]
+            teacher_name = self.teachers[course['teacher_code']]['full_name'][:29]
+            place_name = self.places[course['place_code']]['name'][:19]
+            place_capacity = self.places[course['place_code']]['capacity']
+            course_gender = self.courses[course['course_code']].get('gender', 0)
+            gender_str = 'خانم' if course_gender == 2 else 'آقا' if course_gender == 1 else 'مشترک'
+            
+            print(f"{day:<10}{time:<15}{course_name:<35}{teacher_name:<30}{place_name:<20}{place_capacity:<10}{gender_str:<10}")
+        
+        print("\nهزینه نهایی:", solution['cost'])
+        
+        # چاپ آمار مکان‌ها در کنسول
+        place_stats = self.calculate_place_statistics(solution)
+        print("\nآمار استفاده از مکان‌ها:")
+        print("-" * 50)
+        for place_code, count in sorted(place_stats.items(), key=lambda x: -x[1]):
+            place_name = self.places[place_code]['name']
+            print(f"{place_name:<30}: {count} کلاس")
@@ -0,0 +1,43 @@
+import random
+
+import numpy as np
+
+
+def seed_sequence(seed=None):
+    """
+    SeedSequence متناظر با یک بذر
+
+    seed می‌تواند None (بذر تازه از سیستم‌عامل)، عدد صحیح یا خود SeedSequence
+    (مثلاً فرزند ساخته‌شده با spawn_seeds) باشد.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def spawn_seeds(seed, count):
+    """
+    بذرهای مستقل برای اجراها، جزیره‌ها یا کارگرها
+
+    فرزند k فقط به (seed، k) وابسته است؛ بنابراین جریان‌ها مستقل از ترتیب و
+    تعداد پردازه‌ها قابل بازتولیدند.
+    """
+    parent = seed_sequence(seed)
+    return [
+        np.random.SeedSequence(parent.entropy, spawn_key=parent.spawn_key + (k,))
+        for k in range(count)
+    ]
+
+
+def make_generators(seed=None):
+    """
+    مولدهای تصادفی مستقل یک زمان‌بند از یک بذر
+
+    خروجی:
+        (random.Random برای انتخاب‌های تکی از فهرست‌ها،
+         numpy.random.Generator برای نمونه‌های دسته‌ای)
+    """
+    sequence = seed_sequence(seed)
+    python_seed, numpy_seed = spawn_seeds(sequence, 2)
+    python_rng = random.Random(int.from_bytes(python_seed.generate_state(4).tobytes(), 'little'))
+    return python_rng, np.random.default_rng(numpy_seed)
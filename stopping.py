@@ -0,0 +1,70 @@
+import time
+
+# دلیل توقف -> توضیح قابل نمایش
+STOP_REASONS = {
+    'target_cost': 'رسیدن به هزینه هدف',
+    'stall': 'عدم بهبود در تعداد تکرار مجاز',
+    'time_limit': 'پایان بودجه زمانی',
+    'max_evaluations': 'پایان بودجه ارزیابی',
+    'max_iterations': 'پایان تعداد تکرارها'
+}
+
+
+class StoppingCriteria:
+    """
+    معیارهای توقف زودهنگام حلقه جستجو
+
+    check در ابتدای هر تکرار با بهترین هزینه تا آن لحظه فراخوانی می‌شود و اولین
+    معیار برقرار را برمی‌گرداند. مقدار None برای هر معیار یعنی غیرفعال.
+    """
+
+    def __init__(self, target_cost=None, stall_patience=None, time_limit=None, max_evaluations=None):
+        self.target_cost = target_cost
+        self.stall_patience = stall_patience
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.start_time = time.perf_counter()
+        self.best_cost = None
+        self.stall = 0
+
+    @classmethod
+    def from_options(cls, options):
+        """ساخت معیارها از کلیدهای OPTIONS زمان‌بند"""
+        return cls(
+            options.get('target_cost'),
+            options.get('stall_patience'),
+            options.get('time_limit'),
+            options.get('max_evaluations')
+        )
+
+    def state(self):
+        """وضعیت شمارنده‌ها برای ذخیره در نقطه بازیابی"""
+        return {'best_cost': self.best_cost, 'stall': self.stall, 'elapsed': self.elapsed()}
+
+    def restore(self, state):
+        """ادامه شمارش از وضعیت ذخیره‌شده (زمان سپری‌شده هم لحاظ می‌شود)"""
+        self.best_cost = state['best_cost']
+        self.stall = state['stall']
+        self.start_time = time.perf_counter() - state['elapsed']
+
+    def elapsed(self):
+        """زمان سپری‌شده از شروع اجرا (ثانیه)"""
+        return time.perf_counter() - self.start_time
+
+    def check(self, best_cost, evaluations):
+        """دلیل توقف (کلید STOP_REASONS) یا None برای ادامه"""
+        if self.best_cost is None or best_cost < self.best_cost:
+            self.best_cost = best_cost
+            self.stall = 0
+        else:
+            self.stall += 1
+
+        if self.target_cost is not None and best_cost <= self.target_cost:
+            return 'target_cost'
+        if self.stall_patience and self.stall >= self.stall_patience:
+            return 'stall'
+        if self.time_limit is not None and self.elapsed() >= self.time_limit:
+            return 'time_limit'
+        if self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            return 'max_evaluations'
+        return None
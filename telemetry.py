@@ -0,0 +1,140 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+from collections import defaultdict
+
+
+class MetricsSink:
+    """
+    مقصد رکوردهای پیشرفت جستجو (یک دیکشنری تخت برای هر تکرار نمونه‌برداری‌شده)
+
+    detailed مشخص می‌کند که آیا زمان‌بند باید شمارش نقض محدودیت‌ها را هم (که
+    هزینه یک ارزیابی اضافه دارد) به رکورد اضافه کند.
+    """
+
+    detailed = True
+
+    def record(self, record):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class NullSink(MetricsSink):
+    """حالت بی‌صدا: رکوردها دور ریخته می‌شوند"""
+
+    detailed = False
+
+    def record(self, record):
+        pass
+
+
+class ConsoleSink(MetricsSink):
+    """چاپ یک خط خلاصه برای هر رکورد (رفتار قبلی run_algorithm)"""
+
+    detailed = False
+
+    def __init__(self, label):
+        self.label = label
+
+    def record(self, record):
+        print(f"{self.label} {record['iteration']}: بهترین هزینه = {record['best_cost']}")
+
+
+class JsonlSink(MetricsSink):
+    """نوشتن هر رکورد به صورت یک خط JSON"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def record(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class CsvSink(MetricsSink):
+    """
+    نوشتن رکوردها در فایل CSV با اجتماع کلیدهای همه رکوردها به عنوان ستون‌ها
+
+    رکوردها در حافظه هم نگه داشته می‌شوند؛ اگر رکوردی کلید تازه‌ای داشته باشد
+    (مثلاً مرحله‌ای که اولین بار در تکرارهای بعدی زمان‌سنجی می‌شود)، فایل با
+    سرستون جدید دوباره نوشته می‌شود و خانه‌های خالی رکوردهای قبلی تهی می‌مانند.
+    در غیر این صورت هر رکورد بلافاصله به انتهای فایل اضافه می‌شود.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.fields = []
+        self.rows = []
+        self.writer = None
+
+    def record(self, record):
+        self.rows.append(record)
+        known = set(self.fields)
+        new_fields = [name for name in record if name not in known]
+        if new_fields:
+            self.fields.extend(new_fields)
+            self._rewrite()
+        else:
+            self.writer.writerow(record)
+        self.file.flush()
+
+    def _rewrite(self):
+        """بازنویسی کامل فایل با سرستون فعلی"""
+        self.file.seek(0)
+        self.file.truncate()
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fields, restval='')
+        self.writer.writeheader()
+        self.writer.writerows(self.rows)
+
+    def close(self):
+        self.file.close()
+
+
+def make_sink(options, label):
+    """
+    ساخت مقصد رکوردها از OPTIONS زمان‌بند
+
+    کلیدها:
+        telemetry: 'console'، 'jsonl'، 'csv' یا 'null'
+        telemetry_file: مسیر فایل برای jsonl و csv
+        verbose: با 0 مقصد console بی‌صدا می‌شود
+    """
+    kind = options.get('telemetry') or 'null'
+    if kind == 'console':
+        return ConsoleSink(label) if options.get('verbose', 1) else NullSink()
+    if kind == 'null':
+        return NullSink()
+    if kind in ('jsonl', 'csv'):
+        if not options.get('telemetry_file'):
+            raise ValueError(f"برای telemetry='{kind}' مسیر telemetry_file لازم است")
+        sink_cls = JsonlSink if kind == 'jsonl' else CsvSink
+        return sink_cls(options['telemetry_file'])
+    raise ValueError(f"مقصد telemetry ناشناخته: {kind}")
+
+
+class PhaseTimer:
+    """جمع زمان صرف‌شده در هر مرحله جستجو (مهاجرت، جهش، اصلاح، ارزیابی و ...)"""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] += time.perf_counter() - start
+
+    def take(self):
+        """زمان هر مرحله از آخرین فراخوانی (نام مراحل دیده‌شده حفظ می‌شود)"""
+        totals = dict(self.totals)
+        for name in self.totals:
+            self.totals[name] = 0.0
+        return totals
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from bbo_new import BBOScheduler
+from export import export_schedule, load_npz
+
+CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml")
+
+
+@pytest.fixture(scope="module")
+def scheduler_and_best():
+    scheduler = BBOScheduler(CONFIG, {'verbose': 0, 'telemetry': 'null'}, seed=0)
+    return scheduler, scheduler.initial_population()[0]
+
+
+@pytest.mark.parametrize("name, fmt", [
+    ("schedule", "npz"),
+    ("schedule.npz", None),
+    ("schedule.csv", None),
+    ("schedule.jsonl", None),
+])
+def test_export_returns_existing_path(tmp_path, scheduler_and_best, name, fmt):
+    scheduler, best = scheduler_and_best
+    path = export_schedule(scheduler, best, str(tmp_path / name), fmt=fmt)
+    assert os.path.exists(path)
+
+
+def test_npz_round_trip_without_extension(tmp_path, scheduler_and_best):
+    scheduler, best = scheduler_and_best
+    path = export_schedule(scheduler, best, str(tmp_path / "schedule"), fmt="npz")
+    courses, cost = load_npz(path)
+    assert path.endswith(".npz")
+    assert cost == best['cost']
+    assert courses == list(best[scheduler.SOLUTION_KEY])
@@ -0,0 +1,38 @@
+from collections import Counter
+from datetime import datetime
+
+
+def term_date(day):
+    """تاریخ تقریبی روز day هفته (فرض می‌کنیم زمان‌بندی در بازه ترم بهار 1403 است)"""
+    return datetime(2024, 4, 1 + (day - 1))
+
+
+def slot_start_minutes(time_slots):
+    """شناسه اسلات -> دقیقه شروع از نیمه‌شب (یک بار به جای strptime در هر ارزیابی)"""
+    minutes = {}
+    for slot_id, ts in time_slots.items():
+        start = datetime.strptime(ts['start'], '%H:%M')
+        minutes[slot_id] = start.hour * 60 + start.minute
+    return minutes
+
+
+def close_slots(slot_minutes, min_hours):
+    """اسلات -> اسلات‌هایی که فاصله شروع آن‌ها کمتر از min_hours ساعت است"""
+    return {
+        s1: [s2 for s2, m2 in slot_minutes.items() if abs(m2 - m1) < min_hours * 60]
+        for s1, m1 in slot_minutes.items()
+    }
+
+
+def maintenance_blocks(constraints, num_days):
+    """(کد مکان، روز) -> تعداد محدودیت‌های place_maintenance که آن روز را پوشش می‌دهند"""
+    blocked = Counter()
+    for constraint in constraints:
+        if constraint['type'] != 'place_maintenance':
+            continue
+        start_date = datetime.strptime(constraint['start_date'], '%Y-%m-%d')
+        end_date = datetime.strptime(constraint['end_date'], '%Y-%m-%d')
+        for day in range(1, num_days + 1):
+            if start_date <= term_date(day) <= end_date:
+                blocked[(constraint['place_code'], day)] += 1
+    return blocked